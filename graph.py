@@ -1,11 +1,17 @@
-from copy import deepcopy
-from heap_piorityqueue import HeapPriorityQueueAdaptive
+from collections import ChainMap, deque
+from itertools import islice
+from heap_piorityqueue import make_priority_queue
 from parition_disjoint_set import Parition
+from graph_cache import PathCache
+from graph_closure import TransitiveClosure
+import graph_components
+import graph_johnson
+from graph_csr import CSRGraph
 
 
 class Graph:
     class _Vertex:
-        __slot__ = "_key"
+        __slots__ = "_key",
 
         def __init__(self, key) -> None:
             self._key = key
@@ -20,7 +26,7 @@ class Graph:
             return hash(id(self))
 
     class _Edge:
-        __slot__ = "_origin", "_destination", "_key"
+        __slots__ = "_origin", "_destination", "_key"
 
         def __init__(self, origin, des, key) -> None:
             """Do not call constructor directly. Use Graph s insert edge(u,v,x)."""
@@ -50,16 +56,37 @@ class Graph:
             return f"({self._origin}, {self._destination}): {self._key} "
 
         def __hash__(self) -> int:
-            return hash(id(self._origin, self._destination))
+            return hash((self._origin, self._destination))
 
     def __init__(self, directed=False) -> None:
         self._out = dict()
         self._in_ = dict() if directed else self._out
+        self._version = 0  # bumped on every change, so derived indexes can tell they are stale
+        self._cache = None  # PathCache of single source results, see enable_cache
+        self._keys = dict()  # vertex key -> vertex, see vertex
 
     """ ULILITY """
 
     def is_directed(self):
-        return self._out is self._in_
+        return self._out is not self._in_
+
+    def version(self):
+        """Mutation counter, changes whenever a vertex or an edge is inserted"""
+        return self._version
+
+    def enable_cache(self, maxsize: int = 128):
+        """Keep up to maxsize single source results of dijkstra and
+        shortest_path_tree, keyed by (source, version).
+
+        Cached dictionaries are shared between callers, do not modify them.
+        """
+        self._cache = PathCache(maxsize)
+
+    def disable_cache(self):
+        self._cache = None
+
+    def cache_stats(self):
+        return None if self._cache is None else self._cache.stats()
 
     def vertex_count(self):
         return len(self._out)
@@ -67,15 +94,29 @@ class Graph:
     def get_vertices(self):
         return self._out.keys()
 
+    def vertex(self, key):
+        """Return the vertex inserted with key, None if there is none"""
+        return self._keys.get(key)
+
     def edge_counts(self):
         total = sum(len(self._out[v]) for v in self._out)
-        return total if self.is_directed() else total // 2
+        if self.is_directed():
+            return total
+
+        # an undirected loop is stored once, every other edge twice
+        loops = sum(1 for v in self._out if v in self._out[v])
+        return (total + loops) // 2
 
     def get_edges(self):
-        edges = set()
+        """Return a list with every edge once"""
+        edges = list()
+        directed = self.is_directed()
 
-        for secondary_map in self._out.values():
-            edges.update(secondary_map.value())
+        for v, secondary_map in self._out.items():
+            for e in secondary_map.values():
+                # undirected edges are in both endpoints maps, keep the origin s one
+                if directed or e._origin is v:
+                    edges.append(e)
 
         return edges
 
@@ -97,8 +138,11 @@ class Graph:
         v = self._Vertex(key)
 
         self._out[v] = dict()
-        if not self.is_directed():
+        if self.is_directed():
             self._in_[v] = dict()
+        if key is not None:
+            self._keys[key] = v
+        self._version += 1
 
         return v
 
@@ -106,11 +150,190 @@ class Graph:
         e = self._Edge(start, end, key)
         self._out[start][end] = e
         self._in_[end][start] = e
+        self._version += 1
 
         return e
 
+    def insert_edges(self, edges):
+        """Insert a batch of (start key, end key) or (start key, end key, edge key)
+        tuples. Vertices are looked up by key and created when missing, a None
+        key always creates a new vertex, as in insert_vertex.
+        """
+        keys, out, in_ = self._keys, self._out, self._in_
+        directed = self.is_directed()
+        Vertex, Edge = self._Vertex, self._Edge
+        count = 0
+
+        def new_vertex(key):
+            v = Vertex(key)
+            out[v] = dict()
+            if directed:
+                in_[v] = dict()
+            if key is not None:
+                keys[key] = v
+            return v
+
+        for item in edges:
+            start = keys.get(item[0])
+            if start is None:
+                start = new_vertex(item[0])
+
+            end = keys.get(item[1])
+            if end is None:
+                end = new_vertex(item[1])
+
+            e = Edge(start, end, item[2] if len(item) > 2 else None)
+            out[start][end] = e
+            in_[end][start] = e
+            count += 1
+
+        self._version += 1
+        return count
+
+    @classmethod
+    def from_edges(cls, edges, directed=False, batch_size: int = 100000):
+        """Build a graph from an iterable of (start key, end key[, edge key]) tuples,
+        consumed batch_size items at a time so it can be a stream
+        """
+        g = cls(directed)
+        edges = iter(edges)
+        while g.insert_edges(islice(edges, batch_size)) == batch_size:
+            pass
+
+        return g
+
+    def snapshot(self):
+        """Return a copy-on-write GraphSnapshot of this graph in O(1).
+
+        The snapshot reads through to this graph and keeps its own copy of an
+        adjacency map only once it changes it. commit() writes the changes
+        back, discard() drops them.
+        """
+        return GraphSnapshot(base=self)
+
+    def copy(self):
+        """Return an independent Graph with the same vertices and edges in O(V + E).
+
+        Vertex and edge objects are shared, the maps are new, so later
+        changes to either graph do not show in the other.
+        """
+        g = Graph(self.is_directed())
+        g._out = {v: dict(row) for v, row in self._out.items()}
+        g._in_ = {v: dict(row) for v, row in self._in_.items()} if self.is_directed() else g._out
+        g._keys = dict(self._keys)
+        return g
+
+    def freeze(self):
+        """Return a read-only CSRGraph snapshot with integer vertex ids.
+
+        Later changes to this graph are not seen by the snapshot.
+        """
+        return CSRGraph.from_graph(self)
+
+    def save(self, path):
+        """Write the graph to a binary CSR file, vertex keys have to be JSON values"""
+        self.freeze().save(path)
+
+    @staticmethod
+    def load(path, mmap=True):
+        """Open a file written by save as a read-only CSRGraph.
+
+        With mmap=True the arrays are mapped, not read, see CSRGraph.load.
+        Vertex keys take the place of the vertices, so csr.vertex(i) is a key.
+        """
+        return CSRGraph.load(path, mmap)
+
     """ TRAVERSAL """
 
+    def _starts(self, starts):
+        # a single vertex is allowed where several start vertices are expected
+        if isinstance(starts, Graph._Vertex):
+            return (starts,)
+        return starts
+
+    def _walk_depth(self, starts, visited: dict, until=None, max_depth=None):
+        # explicit stack of (vertex, remaining incident edges, depth)
+        # so deep graphs do not hit the recursion limit
+        stack = list()
+        for s in self._starts(starts):
+            if s not in visited:
+                visited[s] = None  # start as a root
+                yield s, None
+                if until is not None and until(s):
+                    return
+
+            stack.append((s, self.get_incident_edges(s), 0))
+            while stack:
+                v, edges, depth = stack[-1]
+                if max_depth is not None and depth >= max_depth:
+                    stack.pop()
+                    continue
+
+                for e in edges:
+                    u = e.oposite(v)
+                    if u not in visited:
+                        visited[u] = e
+                        yield u, e
+                        if until is not None and until(u):
+                            return
+
+                        stack.append((u, self.get_incident_edges(u), depth + 1))
+                        break
+                else:
+                    stack.pop()
+
+    def _walk_breadth(self, starts, visited: dict, until=None, max_depth=None):
+        queue = deque()
+        for s in self._starts(starts):
+            if s not in visited:
+                visited[s] = None  # start as a root
+                yield s, None
+                if until is not None and until(s):
+                    return
+
+            queue.append((s, 0))
+
+        while queue:
+            v, depth = queue.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
+
+            for e in self.get_incident_edges(v):
+                u = e.oposite(v)
+                if u not in visited:
+                    visited[u] = e
+                    yield u, e
+                    if until is not None and until(u):
+                        return
+
+                    queue.append((u, depth + 1))
+
+    def DFS_iter(self, starts, until=None, max_depth=None):
+        """Lazy Deapth First Search
+
+        Args:
+            starts (Graph.Vertex | iterable): one or several start vertices
+            until (callable, optional): stop right after a vertex for which until(vertex) is true
+            max_depth (int, optional): do not walk further than this many edges from a start
+
+        Yields:
+            tuple: (vertex, discovery edge), the edge is None for start vertices
+        """
+        return self._walk_depth(starts, dict(), until, max_depth)
+
+    def BFS_iter(self, starts, until=None, max_depth=None):
+        """Lazy Breadth First Search, level by level from all start vertices at once
+
+        Args:
+            starts (Graph.Vertex | iterable): one or several start vertices
+            until (callable, optional): stop right after a vertex for which until(vertex) is true
+            max_depth (int, optional): do not walk further than this many edges from a start
+
+        Yields:
+            tuple: (vertex, discovery edge), the edge is None for start vertices
+        """
+        return self._walk_breadth(starts, dict(), until, max_depth)
+
     def DFS(self, start, visited: dict):
         """Deapth First Search
 
@@ -118,27 +341,24 @@ class Graph:
         Args:
             g (Graph): 
             start (Graph.Vertex):
-            visited (dict): pair of vertex, edged used to walk
+            visited (dict): pair of vertex, edged used to walk, start is paired with None
         """
-        for e in self.get_incident_edges(start):
-            # Get its path the collorative vertexes.
-            # For each vertex, add it into visited dictionary if it is not there.
-            # We use visited list as a dictionary
-            # for saving the edges along its endpoint vertexes
-            next_v = e.oposite(start)
-            if next_v not in visited:
-                visited[next_v] = e
-                # print(next_v._key, visited[next_v]._key)
-                self.DFS(next_v, visited)
-
-    def construct_path(self, start, end, all_path):  # i can not remove self argument
+        for _ in self._walk_depth(start, visited):
+            pass
+
+        return visited
+
+    def construct_path(self, start, end, all_path=None):  # i can not remove self argument
         """Get path from start to end
 
         Args:
             start (Graph.Vertex): 
             end (Graph.Vertex): 
-            visited (dict): DFS result fron start node, i.e All possible route from the start
+            visited (dict): DFS result fron start node, i.e All possible route from the start,
+                the (cached) shortest path tree of start when omitted
         """
+        if all_path is None:
+            all_path = self.shortest_path_tree(start)
 
         path = list()
         if end in all_path:
@@ -154,60 +374,227 @@ class Graph:
 
     def DFS_complete(self):
         forest = dict()
-        for v in self.get_vertices():
-            if v not in forest:
-                forest[v] = None  # start as a root
-                self.DFS(v, forest)
+        for _ in self._walk_depth(self.get_vertices(), forest):
+            pass
 
         return forest
 
     def BFS(self, start, visited: dict):
-        level = list(start)
-
-        while len(level) > 0:
-            next_level = list()
-            for s in level:
-                for e in self.get_incident_edges(s):
-                    v = e.oposite(s)
-                    if v not in visited:
-                        next_level.append(v)
-                        visited[v] = e
+        """Breadth First Search, start may be one vertex or several
 
-            level = next_level
+            NOTE: USE VISITED ARGUMENT ALSO AS THE RESULT
+        """
+        for _ in self._walk_breadth(start, visited):
+            pass
 
         return visited
 
     """ SHOARTEST PATH OF CLOSURE"""
 
-    def dijkstra(self, start, end):
-        q = HeapPriorityQueueAdaptive()
-        q_pointer = dict()
-        dist = dict()
+    def dijkstra(self, start, end=None, bidirectional=False, landmarks=None, backend="locator"):
+        """Shortest distances from start, edge keys are the weights.
 
-        visited = dict()
+        Vertices enter the queue only when they are first reached. When end
+        is given the search stops as soon as end is settled.
 
-        # initialize
-        for v in self.get_vertices():
-            dist[v] = 0 if v is start else float("inf")
+        Args:
+            start (Graph.Vertex):
+            end (Graph.Vertex, optional): target of a point-to-point query
+            bidirectional (bool): also search backward from end over incoming
+                edges, only the vertices of the shortest path are returned
+            landmarks (LandmarkIndex, optional): run A* towards end with the
+                landmark lower bounds of this graph s index
+            backend (str): priority queue, "locator" (HeapPriorityQueueAdaptive),
+                "heapq" (lazy deletion) or "radix" (non-negative integer weights)
+
+        Returns:
+            dict: settled vertex to its distance from start, in settling
+                (or path) order. end is missing when it can not be reached
+        """
+        if landmarks is not None:
+            if end is None or bidirectional:
+                raise ValueError("Landmark search needs an end vertex and is one directional")
+            if not landmarks.is_valid(self):
+                raise ValueError("Landmark index is out of date, build it again")
+            if backend == "radix":
+                raise ValueError("Landmark bounds are floats, the radix backend needs integer priorities")
+
+        if bidirectional and end is not None:
+            return self._bidirectional_dijkstra(start, end, backend)
+
+        if self._cache is not None and landmarks is None:
+            key = ("dijkstra", start, self._version)
+            # a full result also answers point-to-point queries
+            if end is None or key in self._cache:
+                result = self._cache.get(key)
+                if result is None:
+                    result = self._cache.put(key, self._dijkstra_search(start, None, None, backend))
+                return result
+
+        return self._dijkstra_search(start, end, landmarks, backend)
+
+    def _dijkstra_search(self, start, end, landmarks, backend):
+        def estimate(v):
+            return 0 if landmarks is None else landmarks.lower_bound(v, end)
+
+        q = make_priority_queue(backend)
+        q_pointer = dict()
+        dist = {start: 0}
+        q_pointer[start] = q.add(start, estimate(start))
 
-            q_pointer[v] = q.add(v, dist[v])
+        visited = dict()
 
         while not q.is_empty():
             vertex, _ = q.remove_min()
             del (q_pointer[vertex])
+            d = dist[vertex]
+            visited[vertex] = d
+            if vertex is end:
+                break
 
             for e in self.get_incident_edges(vertex):
                 u = e.oposite(vertex)
+                if u in visited:
+                    continue
 
-                if u in q_pointer and e._key + dist[vertex] < dist[u]:
-                    dist[u] = dist[vertex] + e._key
-                    visited[u] = dist[u]
-
-                    q.update(q_pointer[u], u, dist[u])
+                new_d = d + e._key
+                if u not in dist:
+                    dist[u] = new_d
+                    q_pointer[u] = q.add(u, new_d + estimate(u))
+                elif new_d < dist[u]:
+                    dist[u] = new_d
+                    q_pointer[u] = q.update(q_pointer[u], u, new_d + estimate(u))
 
         return visited
 
-    def shortest_path_tree(self, start, min_dist: dict):
+    def _bidirectional_dijkstra(self, start, end, backend="locator"):
+        if start is end:
+            return {start: 0}
+
+        # one queue per direction, forward over outgoing edges of start side
+        # and backward over incoming edges of end side
+        queues = (make_priority_queue(backend), make_priority_queue(backend))
+        pointers = ({start: queues[0].add(start, 0)},
+                    {end: queues[1].add(end, 0)})
+        dist = ({start: 0}, {end: 0})
+        parent = ({start: None}, {end: None})
+        settled = (set(), set())
+
+        best = float("inf")
+        meet = None
+        side = 0
+        while not queues[0].is_empty() and not queues[1].is_empty():
+            # no shorter path can be found once both frontiers together pass best
+            if queues[0].min()[1] + queues[1].min()[1] >= best:
+                break
+
+            q = queues[side]
+            vertex, d = q.remove_min()
+            del (pointers[side][vertex])
+            settled[side].add(vertex)
+
+            for e in self.get_incident_edges(vertex, outgoing=side == 0):
+                u = e.oposite(vertex)
+                if u in settled[side]:
+                    continue
+
+                new_d = d + e._key
+                if u not in dist[side]:
+                    dist[side][u] = new_d
+                    parent[side][u] = vertex
+                    pointers[side][u] = q.add(u, new_d)
+                elif new_d < dist[side][u]:
+                    dist[side][u] = new_d
+                    parent[side][u] = vertex
+                    pointers[side][u] = q.update(pointers[side][u], u, new_d)
+
+                if u in dist[1 - side] and dist[side][u] + dist[1 - side][u] < best:
+                    best = dist[side][u] + dist[1 - side][u]
+                    meet = u
+
+            side = 1 - side
+
+        if meet is None:
+            return dict()
+
+        path = list()
+        walk = meet
+        while walk is not None:
+            path.append(walk)
+            walk = parent[0][walk]
+        path.reverse()
+
+        walk = parent[1][meet]
+        while walk is not None:
+            path.append(walk)
+            walk = parent[1][walk]
+
+        result = dict()
+        total = 0
+        for i, v in enumerate(path):
+            if i > 0:
+                total += self.get_edges_frompair(path[i - 1], v)._key
+            result[v] = total
+
+        return result
+
+    def distance_matrix(self, sources, targets=None, workers: int = 1):
+        """One-to-many or many-to-many shortest distances.
+
+        The searches run on one frozen CSRGraph copy of this graph, in a
+        process pool when workers > 1.
+
+        Args:
+            sources (iterable): start vertices, one row each
+            targets (iterable, optional): columns, every vertex when omitted
+            workers (int): number of processes
+
+        Returns:
+            list: array("d") rows, matrix[i][j] is the distance from
+                sources[i] to targets[j] (inf when unreachable)
+        """
+        csr = self.freeze()
+        source_ids = [csr.vertex_id(v) for v in sources]
+        target_ids = None if targets is None else [csr.vertex_id(v) for v in targets]
+        return csr.distance_matrix(source_ids, target_ids, workers)
+
+    def johnson(self, sources=None, workers: int = 1, backend: str = "heapq"):
+        """All pairs shortest distances with negative edges allowed, streamed row by row.
+
+        Runs graph_johnson.johnson on a frozen CSRGraph copy of this graph.
+
+        Args:
+            sources (iterable, optional): start vertices, every vertex when omitted
+            workers (int): number of processes
+            backend (str): "heapq" or "locator" priority queue
+
+        Yields:
+            tuple: (source vertex, array("d") row), row[j] is the distance to
+                the j-th vertex of get_vertices() (inf when unreachable)
+
+        Raises:
+            ValueError: when there is a negative cycle
+        """
+        csr = self.freeze()
+        source_ids = None if sources is None else [csr.vertex_id(v) for v in sources]
+        for i, row in graph_johnson.johnson(csr, source_ids, workers, backend):
+            yield csr.vertex(i), row
+
+    def shortest_path_tree(self, start, min_dist: dict = None):
+        """Map each reached vertex to the edge it is reached by on a shortest path.
+
+        min_dist is a dijkstra result of start, computed (and cached) when omitted.
+        """
+        if min_dist is None:
+            if self._cache is not None:
+                key = ("tree", start, self._version)
+                tree = self._cache.get(key)
+                if tree is None:
+                    tree = self._cache.put(key, self.shortest_path_tree(start, self.dijkstra(start)))
+                return tree
+
+            min_dist = self.dijkstra(start)
+
         tree = dict()
         for v in min_dist:
             if v is not start:
@@ -215,45 +602,54 @@ class Graph:
                 for e in self.get_incident_edges(v, False):
                     u = e.oposite(v)
 
-                    if min_dist[v] == min_dist[u] + e._key:
+                    if u in min_dist and min_dist[v] == min_dist[u] + e._key:
                         tree[v] = e
-                        continue
+                        break
 
         return tree
 
+    def transitive_closure(self):
+        """Return a TransitiveClosure answering reachable(u, v) in O(1)"""
+        return TransitiveClosure(self)
+
     def floyd_warshall(self):
-        """Return a new graph that is the transitive closure of graph"""
-        closure = deepcopy(self)  # imported from copy module
-        vertecies = list(self.get_vertices)  # make indexable list
-        leng = len(vertecies)
-
-        for i in range(leng):
-            for ii in range(leng):
-                # verify that edge (i,ii) exists in the partial closure
-                if i != ii and closure.get_edges_frompair(vertecies[i], vertecies[ii]) is not None:
-                    for iii in range(leng):
-                        # verify that edge (ii,iii) exists in the partial closure
-                        if i != iii and ii != iii and closure.get_edges_frompair(vertecies[ii], vertecies[iii]) is not None:
-                            # if (i,j) not yet included, add it to the closure
-                            if closure.get_edges_frompair(vertecies[i], vertecies[iii]) is None:
-                                closure.insert_edge(
-                                    vertecies[i], vertecies[iii])
+        """Return a new graph that is the transitive closure of graph.
+
+        The result is a copy, see copy, so it shares the vertex and edge
+        objects of this graph but not its later changes.
+        """
+        return self._close(self.copy())
+
+    def _close(self, closure):
+        reach = self.transitive_closure()
+        vertecies = list(closure.get_vertices())  # same order as the ids of reach
+
+        for i in range(len(vertecies)):
+            for ii in reach.reachable_ids(i):
+                # if (i,ii) not yet included, add it to the closure
+                if i != ii and closure.get_edges_frompair(vertecies[i], vertecies[ii]) is None:
+                    closure.insert_edge(vertecies[i], vertecies[ii])
 
         return closure
 
     """ SHOREST SPANNING TREE """
 
-    def MST_prim(self):
-        """Compute a minimum spanning tree of a graph using Kruskal s algorithm. 
+    def MST_prim(self, backend="locator"):
+        """Compute a minimum spanning tree of a graph using Prim s algorithm. 
         Return a dictionary of vertices with used edges that comprise the MST. 
 
         The elements of the graph s edges are assumed to be weights.
+        backend is "locator" or "heapq", see dijkstra. Prim pops keys out of
+        order, so the monotone "radix" queue can not be used here.
         """
+        if backend == "radix":
+            raise ValueError("Radix heap needs monotone keys, Prim s algorithm does not have them")
+
         root = None
         dist = dict()
         prev = dict()
         # piority queue
-        Q = HeapPriorityQueueAdaptive()
+        Q = make_priority_queue(backend)
         locator = dict()
 
         for v in self.get_vertices():
@@ -274,13 +670,10 @@ class Graph:
                     dist[u] = e._key
                     prev[u] = e
 
-                    Q.update(locator[u], u, dist[u])
+                    locator[u] = Q.update(locator[u], u, dist[u])
 
         return prev
 
-    class Partition:
-        ...
-
     def MST_krusal(self):
         """Compute a minimum spanning tree of a graph using Kruskal s algorithm. 
         Return a list of edges that comprise the MST. 
@@ -288,35 +681,72 @@ class Graph:
         The elements of the graph s edges are assumed to be weights."""
 
         tree = list()  # list of edges in spanning tree
-        Q = HeapPriorityQueueAdaptive()  # entries are edges in G, with weights as key
-        forest = self.Partition()  # keeps track of forest clusters
+        forest = Parition()  # keeps track of forest clusters
         position = dict()  # map each node to its Partition entry
 
         for v in self.get_vertices():
             position[v] = forest.make_group(v)
 
-        for e in self.get_edges():
-            Q.add(e, e._key)
+        # one bulk sort instead of a heap operation per edge
+        edges = self.get_edges()
+        edges.sort(key=Graph._Edge.get_key)
 
         n_vertex = self.vertex_count()
-        while len(tree) != n_vertex and not Q.is_empty():
-            # tree not spanning and unprocessed edges remain
-            e, _ = Q.remove_min()
-            u, v = e.endpoints()
+        for e in edges:
+            if len(tree) == n_vertex - 1:
+                break  # tree is spanning
 
-            a = forest.find(u)
-            b = forest.find(v)
-            if a != b:
+            u, v = e.endpoints()
+            if forest.union(position[u], position[v]):
                 tree.append(e)
-                forest.union(a, b)
 
         return tree
 
+    """ COMPONENTS """
+
+    def strongly_connected_components(self):
+        """Return (count, labels), labels[i] is the component id of the i-th vertex
+        of get_vertices(), see graph_components"""
+        return graph_components.strongly_connected_components(self)
+
+    def weakly_connected_components(self):
+        return graph_components.weakly_connected_components(self)
+
+    def condensation(self):
+        """Return (DAG of the strongly connected components, labels)"""
+        return graph_components.condensation(self)
+
+    """ CENTRALITY """
+
+    def pagerank(self, alpha=0.85, personalization: dict = None, **options):
+        """PageRank with NumPy power iteration, see graph_centrality.pagerank.
+
+        personalization maps vertices to teleport weights.
+        Returns a dictionary of vertex to score.
+        """
+        import graph_centrality  # needs NumPy, only loaded when used
+
+        csr = self.freeze()
+        if personalization is not None:
+            personalization = {csr.vertex_id(v): w for v, w in personalization.items()}
+        if options.get("dangling") is not None:
+            options["dangling"] = {csr.vertex_id(v): w for v, w in options["dangling"].items()}
+
+        scores = graph_centrality.pagerank(csr, alpha, personalization, **options)
+        return dict(zip(self.get_vertices(), scores.tolist()))
+
+    def eigenvector_centrality(self, **options):
+        """Eigenvector centrality with NumPy power iteration, as a dictionary of vertex to score"""
+        import graph_centrality  # needs NumPy, only loaded when used
+
+        scores = graph_centrality.eigenvector_centrality(self.freeze(), **options)
+        return dict(zip(self.get_vertices(), scores.tolist()))
+
     """ TOPOLICICAL ORDER, ACYLIC TREE """
 
     def topological_sort(self):
         topo_order = list()
-        zero_deg = list()
+        zero_deg = deque()
 
         in_deg = dict()
         for v in self.get_vertices():  # get incoming degree
@@ -326,7 +756,7 @@ class Graph:
                 topo_order.append(v)
 
         while zero_deg:
-            v = zero_deg.pop(0)
+            v = zero_deg.popleft()
             for e in self.get_incident_edges(v):
                 u = e.oposite(v)
                 in_deg[u] -= 1
@@ -337,13 +767,270 @@ class Graph:
 
         return topo_order
 
+    def topological_levels(self):
+        """Kahn levels: level i holds the vertices whose longest chain of
+        predecessors has i edges, vertices of one level are independent.
+
+        Vertices on a cycle never reach in-degree zero and are left out.
+        """
+        levels = list()
+        in_deg = dict()
+        level = list()
+        for v in self.get_vertices():
+            in_deg[v] = self.get_degree(v, outgoing=False)
+            if in_deg[v] == 0:
+                level.append(v)
+
+        while level:
+            levels.append(level)
+            next_level = list()
+            for v in level:
+                for e in self.get_incident_edges(v):
+                    u = e.oposite(v)
+                    in_deg[u] -= 1
+                    if in_deg[u] == 0:
+                        next_level.append(u)
+
+            level = next_level
+
+        return levels
+
     """ CLOSURE TOUR """
 
-    def is_eulerian(self):
-        ...
+    def _eulerian_start(self, circuit: bool):
+        # degree condition only: the start of an Eulerian trail (or circuit),
+        # None if the degrees do not allow one
+        start = None
+        ends = 0
+        for v in self.get_vertices():
+            if self.is_directed():
+                balance = self.get_degree(v) - self.get_degree(v, outgoing=False)
+                if balance == 1:
+                    start = v
+                if balance != 0:
+                    ends += 1
+                    if abs(balance) > 1:
+                        return None
+            else:
+                # a loop is stored once but adds two to the degree
+                degree = self.get_degree(v) + (self.get_edges_frompair(v, v) is not None)
+                if degree % 2 == 1:
+                    ends += 1
+                    if start is None:
+                        start = v
+
+        if ends == 0:
+            # any vertex with an edge will do
+            for v in self.get_vertices():
+                if self.get_degree(v) > 0:
+                    return v
+            return None
+
+        if circuit or ends != 2 or start is None:
+            return None
+        return start
+
+    def is_eulerian(self, circuit=True):
+        """True if one closed walk (or, with circuit=False, one walk) uses every edge exactly once"""
+        if self.edge_counts() == 0:
+            return True
+        if self._eulerian_start(circuit) is None:
+            return False
+
+        # every edge has to be in one weakly connected component
+        count, labels = self.weakly_connected_components()
+        used = set()
+        for i, v in enumerate(self.get_vertices()):
+            if self.get_degree(v) > 0 or self.get_degree(v, outgoing=False) > 0:
+                used.add(labels[i])
+
+        return len(used) <= 1
+
+    def eulerian_path(self, circuit=False):
+        """Hierholzer s algorithm in O(E).
+
+        Returns:
+            iterator: the edges of an Eulerian trail in walking order, a
+                closed one when the graph has it (or circuit=True asks for it)
+
+        Raises:
+            ValueError: when no such trail exists
+        """
+        start = self._eulerian_start(circuit)
+        if start is None:
+            if self.edge_counts() == 0:
+                return iter(())
+            raise ValueError("Graph has no Eulerian " + ("circuit" if circuit else "path"))
+
+        used = set()
+        remaining = dict()  # vertex -> iterator over its not yet tried edges
+        stack = [(start, None)]
+        trail = list()
+        while stack:
+            v, via = stack[-1]
+            if v not in remaining:
+                remaining[v] = self.get_incident_edges(v)
+
+            for e in remaining[v]:
+                if e not in used:
+                    used.add(e)
+                    stack.append((e.oposite(v), e))
+                    break
+            else:
+                stack.pop()
+                if via is not None:
+                    trail.append(via)
+
+        if len(trail) != self.edge_counts():
+            raise ValueError("Graph has no Eulerian path, its edges are not connected")
+
+        return reversed(trail)
+
+
+class _Layer(ChainMap):
+    """Map read through to base, every write goes to the first map.
+
+    Graphs never delete vertices or keys, so the length is counted instead
+    of taken from the union of both maps. Every read first lets the owning
+    snapshot check that its base has not moved under it.
+    """
+
+    def __init__(self, base, owner) -> None:
+        super().__init__(dict(), base)
+        self._added = 0
+        self._owner = owner
+
+    def __getitem__(self, key):
+        self._owner._check_base()
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        self._owner._check_base()
+        return super().__contains__(key)
+
+    def __iter__(self):
+        self._owner._check_base()
+        return super().__iter__()
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            self._added += 1
+        self.maps[0][key] = value
+
+    def __len__(self):
+        self._owner._check_base()
+        return len(self.maps[1]) + self._added
+
+
+class GraphSnapshot(Graph):
+    """Copy-on-write overlay of a Graph, see Graph.snapshot.
+
+    Vertices, keys and adjacency maps of the base are shared. The first
+    change to an adjacency map copies that one map into the delta layer,
+    new vertices live only there.
+
+    Changes to the base are seen through a snapshot without changes of its
+    own. Once the snapshot has changes, its copied maps would disagree with
+    a changed base, so reading it then raises ValueError until discard().
+    The version counts the changes of both, so caches never go stale.
+    """
+
+    def __init__(self, directed=False, *, base=None) -> None:
+        """Without base the snapshot starts from an empty Graph(directed)"""
+        if base is None:
+            base = Graph(directed)
+
+        self._base = base
+        self._changes = 0
+        super().__init__(base.is_directed())
+        self._reset()
+
+    @property
+    def _version(self):
+        return self._base._version + self._changes
+
+    @_version.setter
+    def _version(self, value):
+        self._changes = value - self._base._version
+
+    def _reset(self):
+        base = self._base
+        self._base_version = base._version
+        self._out = _Layer(base._out, self)
+        self._in_ = _Layer(base._in_, self) if base.is_directed() else self._out
+        self._keys = _Layer(base._keys, self)
+        self._version += 1
+
+    def _check_base(self):
+        if self._base._version == self._base_version:
+            return
+        if self._out.maps[0] or self._in_.maps[0] or self._keys.maps[0]:
+            raise ValueError("Base graph changed under a snapshot with its own changes, discard() it")
+        self._base_version = self._base._version  # nothing of ours to disagree with
+
+    def _own(self, start, end):
+        # copy the maps insert_edge(start, end) writes to, once
+        self._check_base()
+        for adj, v in ((self._out, start), (self._in_, end)):
+            if v not in adj.maps[0]:
+                adj.maps[0][v] = dict(adj.maps[1][v])
 
-    def eulerian_path(self):
-        ...
+    """ INSERT """
+
+    def insert_edge(self, start, end, key=None):
+        self._own(start, end)
+        return super().insert_edge(start, end, key)
+
+    def insert_edges(self, edges):
+        count = 0
+        for item in edges:
+            start = self._keys.get(item[0])
+            if start is None:
+                start = self.insert_vertex(item[0])
+            end = self._keys.get(item[1])
+            if end is None:
+                end = self.insert_vertex(item[1])
+
+            self.insert_edge(start, end, item[2] if len(item) > 2 else None)
+            count += 1
+
+        return count
+
+    """ DELTA """
+
+    def base(self):
+        return self._base
+
+    def changed_vertices(self):
+        """Vertices that are new or whose adjacency maps were copied"""
+        changed = set(self._out.maps[0])
+        if self.is_directed():
+            changed.update(self._in_.maps[0])
+        return changed
+
+    def commit(self):
+        """Write the changes into the base graph and start an empty delta.
+
+        Raises:
+            ValueError: when the base changed since the snapshot (or the last
+                commit or discard) and the snapshot has changes
+        """
+        base = self._base
+        self._check_base()
+
+        layers = [(self._out, base._out), (self._keys, base._keys)]
+        if self.is_directed():
+            layers.append((self._in_, base._in_))
+        for layer, target in layers:
+            for k, value in layer.maps[0].items():
+                target[k] = value
+
+        base._version += 1
+        self._reset()
+
+    def discard(self):
+        """Drop every change, the snapshot reads the base again"""
+        self._reset()
 
 
 """ ultility """
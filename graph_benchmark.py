@@ -0,0 +1,54 @@
+"""Timing of Graph algorithms on random graphs, run as a script:
+
+    python graph_benchmark.py
+"""
+import random
+from time import perf_counter
+
+from graph import Graph
+from heap_piorityqueue import PRIORITY_QUEUES
+
+
+def random_graph(n: int, m: int, directed=False, seed: int = 0, max_weight: int = 100) -> tuple:
+    """Random graph with n vertices and about m integer weighted edges"""
+    rng = random.Random(seed)
+    g = Graph(directed)
+    vertices = [g.insert_vertex(i) for i in range(n)]
+    for i in range(1, n):  # spanning path keeps it connected
+        g.insert_edge(vertices[i - 1], vertices[i], rng.randint(1, max_weight))
+    for _ in range(m - n + 1):
+        u, v = rng.sample(vertices, 2)
+        g.insert_edge(u, v, rng.randint(1, max_weight))
+
+    return g, vertices
+
+
+def timeit(function, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        best = min(best, perf_counter() - start)
+
+    return best
+
+
+def bench_priority_queues():
+    cases = [
+        ("sparse", 20000, 60000),
+        ("dense", 1000, 200000),
+    ]
+    print(f"{'graph':<8}{'backend':<10}{'dijkstra (s)':>14}{'prim (s)':>12}")
+    for name, n, m in cases:
+        g, vertices = random_graph(n, m)
+        for backend in PRIORITY_QUEUES:
+            dijkstra = timeit(lambda: g.dijkstra(vertices[0], backend=backend))
+            if backend == "radix":
+                prim = "-"  # Prim keys are not monotone
+            else:
+                prim = f"{timeit(lambda: g.MST_prim(backend)):.3f}"
+            print(f"{name:<8}{backend:<10}{dijkstra:>14.3f}{prim:>12}")
+
+
+if __name__ == "__main__":
+    bench_priority_queues()
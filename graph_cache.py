@@ -0,0 +1,56 @@
+from collections import OrderedDict
+
+
+class PathCache:
+    """Bounded least-recently-used cache for shortest path results.
+
+    Keys carry the graph version they were computed for, so results of an
+    older graph are never hit again and just age out of the cache.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        if maxsize <= 0:
+            raise ValueError("Cache size must be positive")
+
+        self._data = OrderedDict()
+        self._maxsize = maxsize
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """Return the cached value and mark it as recently used"""
+        if key in self._data:
+            self._hits += 1
+            self._data.move_to_end(key)
+            return self._data[key]
+
+        self._misses += 1
+        return default
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+            self._evictions += 1
+
+        return value
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "size": len(self._data),
+            "maxsize": self._maxsize,
+        }
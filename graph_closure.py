@@ -0,0 +1,59 @@
+from graph_components import tarjan
+
+
+class TransitiveClosure:
+    """Reachability between every pair of vertices of a Graph.
+
+    Strongly connected components are condensed first, then the reachable
+    set of every component is one bitset, ORed together from its successors
+    in reverse topological order. Bitsets are computed as Python ints and
+    kept as bytes, so reachable(u, v) is a single byte lookup.
+    The closure is reflexive, every vertex reaches itself.
+    """
+
+    def __init__(self, graph) -> None:
+        csr = graph.freeze()
+        self._csr = csr
+        offsets, targets = csr._offsets, csr._targets
+        count, comp = tarjan(csr.vertex_count(),
+                             lambda v: targets[offsets[v]:offsets[v + 1]])
+        self._comp = comp
+
+        # vertices grouped by component
+        members = [list() for _ in range(count)]
+        for v in range(csr.vertex_count()):
+            members[comp[v]].append(v)
+
+        reach = list()
+        for c in range(count):
+            bits = 1 << c
+            for v in members[c]:
+                for i in range(offsets[v], offsets[v + 1]):
+                    d = comp[targets[i]]
+                    if d != c:
+                        bits |= reach[d]  # d < c, already done
+            reach.append(bits)
+
+        size = (count + 7) // 8
+        self._reach = [bits.to_bytes(size, "little") for bits in reach]
+        self._members = members
+
+    def reachable(self, u, v) -> bool:
+        """True if there is a path from vertex u to vertex v"""
+        return self.reachable_id(self._csr.vertex_id(u), self._csr.vertex_id(v))
+
+    def reachable_id(self, u: int, v: int) -> bool:
+        c = self._comp[v]
+        return bool(self._reach[self._comp[u]][c >> 3] >> (c & 7) & 1)
+
+    def reachable_ids(self, u: int):
+        """Yield the ids of every vertex reachable from vertex id u"""
+        reach = self._reach[self._comp[u]]
+        for c in range(len(self._members)):
+            if reach[c >> 3] >> (c & 7) & 1:
+                yield from self._members[c]
+
+    def reachable_from(self, u):
+        """Yield every vertex reachable from vertex u"""
+        for v in self.reachable_ids(self._csr.vertex_id(u)):
+            yield self._csr.vertex(v)
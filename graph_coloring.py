@@ -0,0 +1,142 @@
+"""Vertex colouring of graphs given as adjacency lists of vertex ids 0..n-1.
+
+The colours a vertex can not take are one int bitmask per vertex, the
+smallest free colour of mask is the lowest zero bit: (~mask & (mask + 1)).
+"""
+from heapq import heappush, heappop
+
+
+def _lowest_free(mask: int) -> int:
+    return (~mask & (mask + 1)).bit_length() - 1
+
+
+def _first(order: list[int], start) -> list[int]:
+    if start is None or order[0] == start:
+        return order
+    return [start] + [v for v in order if v != start]
+
+
+""" ORDERINGS """
+
+
+def largest_first_order(adjacent: list[list[int]]) -> list[int]:
+    """Vertices by decreasing degree, a counting sort on the degrees"""
+    buckets = [list() for i in range(max(map(len, adjacent), default=0) + 1)]
+    for v, row in enumerate(adjacent):
+        buckets[len(row)].append(v)
+
+    return [v for bucket in reversed(buckets) for v in bucket]
+
+
+def smallest_last_order(adjacent: list[list[int]]) -> list[int]:
+    """Repeatedly remove a vertex of smallest remaining degree, colour in reverse.
+
+    Greedy colouring in this order uses at most degeneracy + 1 colours. The
+    remaining degrees live in a bucket queue, so the whole order is O(V + E).
+    """
+    n = len(adjacent)
+    degree = [len(row) for row in adjacent]
+    buckets = [set() for i in range(max(degree, default=0) + 1)]
+    for v in range(n):
+        buckets[degree[v]].add(v)
+
+    removed = bytearray(n)
+    order = list()
+    low = 0
+    for _ in range(n):
+        while not buckets[low]:
+            low += 1
+        v = buckets[low].pop()
+        removed[v] = 1
+        order.append(v)
+
+        for u in adjacent[v]:
+            if not removed[u]:
+                buckets[degree[u]].discard(u)
+                degree[u] -= 1
+                buckets[degree[u]].add(u)
+        low = max(low - 1, 0)  # a neighbour may have dropped one bucket below
+
+    order.reverse()
+    return order
+
+
+""" COLORING """
+
+
+def greedy_coloring(adjacent: list[list[int]], order) -> list[int]:
+    """Give each vertex of order the smallest colour none of its coloured neighbours has"""
+    forbidden = [0 for i in range(len(adjacent))]
+    colors = [-1 for i in range(len(adjacent))]
+    for v in order:
+        c = colors[v] = _lowest_free(forbidden[v])
+        for u in adjacent[v]:
+            forbidden[u] |= 1 << c
+
+    return colors
+
+
+def dsatur(adjacent: list[list[int]], start: int = None) -> list[int]:
+    """Brelaz s DSatur, always colour the vertex seeing the most distinct colours.
+
+    Uncoloured vertices wait in one bucket per saturation degree, each a heap
+    on the degree to break ties. Entries are replaced lazily: a vertex is
+    pushed again when its saturation grows and stale entries are skipped.
+    """
+    n = len(adjacent)
+    forbidden = [0 for i in range(n)]
+    saturation = [0 for i in range(n)]
+    colors = [-1 for i in range(n)]
+    buckets = [list()]  # saturation -> heap of (-degree, vertex)
+    for v in range(n):
+        heappush(buckets[0], (-len(adjacent[v]), v))
+    if start is not None:
+        heappush(buckets[0], (-n - 1, start))  # ahead of every degree
+
+    top = 0
+    for _ in range(n):
+        while True:
+            while not buckets[top]:
+                top -= 1
+            _, v = heappop(buckets[top])
+            if colors[v] == -1 and saturation[v] == top:
+                break  # not a stale entry
+
+        c = colors[v] = _lowest_free(forbidden[v])
+        bit = 1 << c
+        for u in adjacent[v]:
+            if colors[u] == -1 and not forbidden[u] & bit:
+                forbidden[u] |= bit
+                s = saturation[u] = saturation[u] + 1
+                if s == len(buckets):
+                    buckets.append(list())
+                heappush(buckets[s], (-len(adjacent[u]), u))
+                top = max(top, s)
+
+    return colors
+
+
+STRATEGIES = ("largest_first", "smallest_last", "dsatur")
+
+
+def color(adjacent: list[list[int]], strategy: str = "dsatur", start: int = None) -> list[int]:
+    """Proper colouring of the vertices, colours are 0, 1, 2, ...
+
+    Args:
+        adjacent (list): neighbour ids of every vertex, symmetric and without self loops
+        strategy (str): one of STRATEGIES
+        start (int, optional): vertex to colour first
+
+    Returns:
+        list: colour of every vertex id
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown coloring strategy {strategy!r}, expected one of {list(STRATEGIES)}")
+    if not adjacent:
+        return list()
+
+    if strategy == "dsatur":
+        return dsatur(adjacent, start)
+    if strategy == "largest_first":
+        return greedy_coloring(adjacent, _first(largest_first_order(adjacent), start))
+    return greedy_coloring(adjacent, _first(smallest_last_order(adjacent), start))
@@ -0,0 +1,414 @@
+from array import array
+from math import isnan
+
+from graph import Graph
+
+
+class CompactGraph(Graph):
+    """Graph with struct-of-arrays storage for large edge counts.
+
+    Vertices are integer ids and edges are rows of the parallel columns
+    _origins/_destinations array("i"), _weights array("d") and the
+    _integral bytearray that marks int keys. Rows are never changed:
+    inserting an edge for a pair that already has one appends a new row
+    and retires the old one, so handles of the old edge keep their key, as
+    the replaced _Edge objects of Graph do.
+
+    Adjacency is a forward star: every vertex has the first and last row
+    of its out (and in) chain, every row the next row of the chain of its
+    origin and of its destination. An open addressing table finds the row
+    of a pair in O(1). All of it is flat arrays, an edge costs a few tens
+    of bytes instead of an _Edge object plus two dict entries.
+
+    Vertex handles are created the first time a vertex is handed out and
+    then reused, so they compare with "is" like Graph vertices. Edge
+    handles are created on demand and compare by edge id. All Graph
+    algorithms work on top, as they only go through the accessors
+    overridden here.
+
+    Edge keys must be numbers or None. They are stored as floats and int
+    keys come back as int, so integer weights stay integral (radix backend,
+    exact distances). Ints beyond 2**53 are rejected, a float can not hold them.
+    """
+
+    class _Vertex(Graph._Vertex):
+        __slots__ = "_id",
+
+        def __init__(self, key, id) -> None:
+            super().__init__(key)
+            self._id = id
+
+    class _Edge:
+        __slots__ = "_graph", "_id"
+
+        def __init__(self, graph, id) -> None:
+            """Do not call constructor directly, handles come from the graph"""
+            self._graph = graph
+            self._id = id
+
+        @property
+        def _origin(self):
+            return self._graph._vertex_at(self._graph._origins[self._id])
+
+        @property
+        def _destination(self):
+            return self._graph._vertex_at(self._graph._destinations[self._id])
+
+        @property
+        def _key(self):
+            key = self._graph._weights[self._id]
+            if isnan(key):
+                return None
+            return int(key) if self._graph._integral[self._id] else key
+
+        def endpoints(self):
+            return (self._origin, self._destination)
+
+        def oposite(self, origin):
+            start = self._graph._origins[self._id]
+            if origin._id == start:
+                return self._graph._vertex_at(self._graph._destinations[self._id])
+            return self._graph._vertex_at(start)
+
+        def get_key(self):
+            return self._key
+
+        def __lt__(self, __other: object):
+            return self._key < __other._key
+
+        def __eq__(self, __other: object) -> bool:
+            return type(self) is type(__other) and self._graph is __other._graph and self._id == __other._id
+
+        def __hash__(self) -> int:
+            return hash(self._id)
+
+        def __str__(self) -> str:
+            return f"({self._origin}, {self._destination}): {self._key} "
+
+    def __init__(self, directed=False) -> None:
+        super().__init__(directed)
+        self._out = self._in_ = None  # not used, see is_directed
+        self._directed = directed
+
+        self._vertex_keys = list()  # id -> key
+        self._handles = list()  # id -> vertex handle, None until handed out
+        self._out_head = array("i")  # id -> first row of the out chain, -1 when empty
+        self._out_tail = array("i")  # id -> last row of the out chain
+        self._out_degree = array("i")
+        if directed:
+            self._in_head, self._in_tail, self._in_degree = array("i"), array("i"), array("i")
+        else:
+            self._in_head, self._in_tail, self._in_degree = self._out_head, self._out_tail, self._out_degree
+
+        self._origins = array("i")
+        self._destinations = array("i")
+        self._weights = array("d")
+        self._integral = bytearray()  # 1 where the key was an int
+        self._next_out = array("i")  # next row in the chain of the origin, -1 at the end
+        self._next_in = array("i")  # next row in the chain of the destination
+        self._current = array("i")  # chain row -> live row of its pair, -1 for replacing rows
+
+        self._pairs = array("i", [-1]) * 8  # hash table of chain rows, at most half full
+        self._edge_count = 0
+
+    """ PRIVATE """
+
+    def _vertex_at(self, i):
+        v = self._handles[i]
+        if v is None:
+            v = self._handles[i] = self._Vertex(self._vertex_keys[i], i)
+        return v
+
+    def _add_vertex(self, key) -> int:
+        i = len(self._vertex_keys)
+        self._vertex_keys.append(key)
+        self._handles.append(None)
+        self._out_head.append(-1)
+        self._out_tail.append(-1)
+        self._out_degree.append(0)
+        if self._directed:
+            self._in_head.append(-1)
+            self._in_tail.append(-1)
+            self._in_degree.append(0)
+        if key is not None:
+            self._keys[key] = i
+
+        return i
+
+    def _slot(self, u: int, v: int) -> int:
+        # linear probing, returns the slot holding the chain row of the pair
+        # or the empty slot where it goes. Undirected pairs hash as (min, max)
+        directed = self._directed
+        if not directed and v < u:
+            u, v = v, u
+        pairs, origins, destinations = self._pairs, self._origins, self._destinations
+        mask = len(pairs) - 1
+        h = u * 0x9E3779B1 + v * 0x85EBCA6B
+        i = (h ^ (h >> 16)) & mask
+        while True:
+            r = pairs[i]
+            if r == -1:
+                return i
+            o, d = origins[r], destinations[r]
+            if (o == u and d == v) or (not directed and o == v and d == u):
+                return i
+            i = (i + 1) & mask
+
+    def _rehash(self, size: int) -> None:
+        self._pairs = array("i", [-1]) * size
+        origins, destinations = self._origins, self._destinations
+        for r, live in enumerate(self._current):
+            if live != -1:
+                self._pairs[self._slot(origins[r], destinations[r])] = r
+
+    def _find_edge(self, u: int, v: int) -> int:
+        r = self._pairs[self._slot(u, v)]
+        return -1 if r == -1 else self._current[r]
+
+    def _next(self, v: int, r: int, outgoing: bool) -> array:
+        # the array holding the link after row r in the chain of v
+        if self._directed:
+            return self._next_out if outgoing else self._next_in
+        return self._next_out if self._origins[r] == v else self._next_in
+
+    def _link(self, v: int, r: int, outgoing: bool) -> None:
+        head, tail, degree = ((self._out_head, self._out_tail, self._out_degree) if outgoing
+                              else (self._in_head, self._in_tail, self._in_degree))
+        last = tail[v]
+        if last == -1:
+            head[v] = r
+        else:
+            self._next(v, last, outgoing)[last] = r
+        tail[v] = r
+        degree[v] += 1
+
+    def _chain(self, v: int, outgoing: bool):
+        # rows of the out (or in) chain of v, _next inlined
+        r = (self._out_head if outgoing else self._in_head)[v]
+        if self._directed:
+            links = self._next_out if outgoing else self._next_in
+            while r != -1:
+                yield r
+                r = links[r]
+            return
+
+        origins, next_out, next_in = self._origins, self._next_out, self._next_in
+        while r != -1:
+            yield r
+            r = next_out[r] if origins[r] == v else next_in[r]
+
+    def _add_edge(self, u: int, v: int, key) -> int:
+        weight = float("nan") if key is None else float(key)
+        integral = isinstance(key, int)
+        if integral and weight != key:
+            raise ValueError(f"Integer edge key {key} does not fit a float exactly")
+
+        slot = self._slot(u, v)
+        first = self._pairs[slot]
+        i = len(self._weights)
+        self._origins.append(u)
+        self._destinations.append(v)
+        self._weights.append(weight)
+        self._integral.append(integral)
+        self._next_out.append(-1)
+        self._next_in.append(-1)
+        if first != -1:
+            # the pair keeps its place in the chains, the new row becomes its live row
+            self._current[first] = i
+            self._current.append(-1)
+            return i
+
+        self._current.append(i)
+        self._pairs[slot] = i
+        self._link(u, i, True)
+        if u != v or self._directed:
+            self._link(v, i, False)
+        self._edge_count += 1
+        if 2 * self._edge_count > len(self._pairs):
+            self._rehash(2 * len(self._pairs))
+
+        return i
+
+    """ ULILITY """
+
+    def is_directed(self):
+        return self._directed
+
+    def vertex_count(self):
+        return len(self._vertex_keys)
+
+    def get_vertices(self):
+        return (self._vertex_at(i) for i in range(len(self._vertex_keys)))
+
+    def vertex(self, key):
+        i = self._keys.get(key)
+        return None if i is None else self._vertex_at(i)
+
+    def edge_counts(self):
+        return self._edge_count
+
+    def get_edges(self):
+        return [self._Edge(self, i) for i in self._current if i != -1]
+
+    def get_edges_frompair(self, u, v):
+        i = self._find_edge(u._id, v._id)
+        return None if i == -1 else self._Edge(self, i)
+
+    def get_degree(self, v, outgoing=True):
+        return (self._out_degree if outgoing else self._in_degree)[v._id]
+
+    def get_incident_edges(self, v, outgoing=True):
+        current = self._current
+        for r in self._chain(v._id, outgoing):
+            yield self._Edge(self, current[r])
+
+    """ COPY """
+
+    def _copy_into(self, g):
+        # every column is copied, the vertex handles are shared
+        g._vertex_keys = list(self._vertex_keys)
+        g._handles = [self._vertex_at(i) for i in range(len(self._vertex_keys))]
+        g._out_head = array("i", self._out_head)
+        g._out_tail = array("i", self._out_tail)
+        g._out_degree = array("i", self._out_degree)
+        if self._directed:
+            g._in_head = array("i", self._in_head)
+            g._in_tail = array("i", self._in_tail)
+            g._in_degree = array("i", self._in_degree)
+        else:
+            g._in_head, g._in_tail, g._in_degree = g._out_head, g._out_tail, g._out_degree
+        g._origins = array("i", self._origins)
+        g._destinations = array("i", self._destinations)
+        g._weights = array("d", self._weights)
+        g._integral = bytearray(self._integral)
+        g._next_out = array("i", self._next_out)
+        g._next_in = array("i", self._next_in)
+        g._current = array("i", self._current)
+        g._pairs = array("i", self._pairs)
+        g._edge_count = self._edge_count
+        g._keys = dict(self._keys)
+        return g
+
+    def copy(self):
+        return self._copy_into(CompactGraph(self._directed))
+
+    def snapshot(self):
+        """Return a CompactSnapshot, with the commit()/discard() API of
+        Graph.snapshot but a copy of the columns, see CompactSnapshot"""
+        return CompactSnapshot(base=self)
+
+    """ INSERT """
+
+    def insert_vertex(self, key=None):
+        i = self._add_vertex(key)
+        self._version += 1
+        return self._vertex_at(i)
+
+    def insert_edge(self, start, end, key=None):
+        i = self._add_edge(start._id, end._id, key)
+        self._version += 1
+        return self._Edge(self, i)
+
+    def insert_edges(self, edges):
+        keys = self._keys
+        count = 0
+        for item in edges:
+            u = keys.get(item[0])
+            if u is None:
+                u = self._add_vertex(item[0])
+            v = keys.get(item[1])
+            if v is None:
+                v = self._add_vertex(item[1])
+
+            self._add_edge(u, v, item[2] if len(item) > 2 else None)
+            count += 1
+
+        self._version += 1
+        return count
+
+
+class CompactSnapshot(CompactGraph):
+    """Snapshot of a CompactGraph with the commit()/discard() API of GraphSnapshot.
+
+    Array columns can not be layered over the base like dictionaries, so a
+    snapshot starts from a copy of them: O(V + E), but only a few tens of
+    bytes per edge. The base is not read afterwards, commit() fails when it
+    changed in the meantime.
+    """
+
+    def __init__(self, directed=False, *, base=None) -> None:
+        """Without base the snapshot starts from an empty CompactGraph(directed)"""
+        if base is None:
+            base = CompactGraph(directed)
+
+        super().__init__(base.is_directed())
+        self._base = base
+        self._reset()
+
+    def _reset(self):
+        base = self._base
+        base._copy_into(self)
+        self._base_version = base._version
+        self._base_vertices = base.vertex_count()
+        self._base_rows = len(base._weights)
+        self._version += 1
+
+    """ DELTA """
+
+    def base(self):
+        return self._base
+
+    def changed_vertices(self):
+        """Vertices that are new or have a new or re-keyed edge"""
+        changed = set(range(self._base_vertices, self.vertex_count()))
+        # rows are append only, a new or re-keyed edge is a row past the base ones
+        for i in range(self._base_rows, len(self._weights)):
+            changed.update((self._origins[i], self._destinations[i]))
+
+        return set(self._vertex_at(i) for i in changed)
+
+    def commit(self):
+        """Write the changes into the base graph and start again from it.
+
+        Raises:
+            ValueError: when the base changed since the snapshot (or the last
+                commit or discard)
+        """
+        base = self._base
+        if base._version != self._base_version:
+            raise ValueError("Base graph changed since the snapshot was taken, can not commit")
+
+        self._copy_into(base)
+        base._version += 1
+        self._reset()
+
+    def discard(self):
+        """Drop every change, the snapshot is a copy of the base again"""
+        self._reset()
+
+
+if __name__ == "__main__":
+    # a loop is its own edge, it must not replace an edge touching the vertex
+    g = CompactGraph()
+    a, b = g.insert_vertex("a"), g.insert_vertex("b")
+    g.insert_edge(a, b, 5)
+    g.insert_edge(a, a, 1)
+    assert g.edge_counts() == 2
+    assert g.get_edges_frompair(a, b).get_key() == 5
+    assert g.get_edges_frompair(a, a).get_key() == 1
+    assert g.get_edges_frompair(b, b) is None
+    print(*g.get_edges())
+
+    # int keys stay int, so the radix queue accepts the distances
+    assert type(g.get_edges_frompair(a, b).get_key()) is int
+    assert g.dijkstra(a, backend="radix")[b] == 5
+    g.insert_edge(b, g.insert_vertex("c"), 2.5)
+    assert g.get_edges_frompair(b, g.vertex("c")).get_key() == 2.5
+
+    # a replaced edge keeps its key, like the replaced _Edge objects of Graph
+    old = g.get_edges_frompair(a, b)
+    g.insert_edge(b, a, 3)
+    assert old.get_key() == 5 and g.get_edges_frompair(a, b).get_key() == 3
+    g.insert_edge(a, a, 4)
+    assert g.get_degree(a) == 2 and g.get_edges_frompair(a, a).get_key() == 4
+    assert g.edge_counts() == 3 and len(g.get_edges()) == 3
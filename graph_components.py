@@ -0,0 +1,138 @@
+from array import array
+from collections import deque
+
+
+def tarjan(n: int, successors):
+    """Iterative Tarjan over vertex ids 0..n-1, successors(v) iterates the ids v points to.
+
+    Components are numbered in the order they complete, which is a reverse
+    topological order of the condensation: edges only go to smaller ids.
+
+    Returns:
+        tuple: (number of components, array of the component id of every vertex)
+    """
+    index = array("i", [-1]) * n
+    low = array("i", [0]) * n
+    comp = array("i", [-1]) * n
+    on_stack = bytearray(n)
+    stack = list()
+    count = 0
+    counter = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, iter(successors(root)))]
+        while work:
+            v, edges = work[-1]
+            for u in edges:
+                if index[u] == -1:
+                    index[u] = low[u] = counter
+                    counter += 1
+                    stack.append(u)
+                    on_stack[u] = 1
+                    work.append((u, iter(successors(u))))
+                    break
+                elif on_stack[u] and index[u] < low[v]:
+                    low[v] = index[u]
+            else:
+                work.pop()
+                if work and low[v] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[v]
+
+                if low[v] == index[v]:  # v is the root of a component
+                    while True:
+                        u = stack.pop()
+                        on_stack[u] = 0
+                        comp[u] = count
+                        if u == v:
+                            break
+                    count += 1
+
+    return count, comp
+
+
+def _ids(graph):
+    vertices = list(graph.get_vertices())
+    index = dict()
+    for i, v in enumerate(vertices):
+        index[v] = i
+
+    return vertices, index
+
+
+def _successors(graph, vertices, index):
+    def successors(i):
+        v = vertices[i]
+        for e in graph.get_incident_edges(v):
+            yield index[e.oposite(v)]
+
+    return successors
+
+
+def strongly_connected_components(graph):
+    """Strongly connected components of a Graph, in linear time without recursion.
+
+    Returns:
+        tuple: (count, labels) where labels[i] is the component of the i-th
+            vertex of graph.get_vertices()
+    """
+    vertices, index = _ids(graph)
+    return tarjan(len(vertices), _successors(graph, vertices, index))
+
+
+def weakly_connected_components(graph):
+    """Components when edge directions are ignored, same result shape as
+    strongly_connected_components. For undirected graphs these are the
+    connected components.
+    """
+    vertices, index = _ids(graph)
+    labels = array("i", [-1]) * len(vertices)
+    count = 0
+
+    for root in range(len(vertices)):
+        if labels[root] != -1:
+            continue
+
+        labels[root] = count
+        queue = deque([root])
+        while queue:
+            v = vertices[queue.popleft()]
+            for outgoing in (True, False):
+                for e in graph.get_incident_edges(v, outgoing):
+                    u = index[e.oposite(v)]
+                    if labels[u] == -1:
+                        labels[u] = count
+                        queue.append(u)
+        count += 1
+
+    return count, labels
+
+
+def condensation(graph):
+    """Directed acyclic graph with one vertex per strongly connected component.
+
+    Vertex keys are the component ids and there is one edge (key None) for
+    every pair of components joined by at least one original edge.
+
+    Returns:
+        tuple: (condensed graph, labels as in strongly_connected_components)
+    """
+    vertices, index = _ids(graph)
+    count, labels = tarjan(len(vertices), _successors(graph, vertices, index))
+    dag = type(graph)(directed=True)
+    nodes = [dag.insert_vertex(c) for c in range(count)]
+
+    for i, v in enumerate(vertices):
+        c = labels[i]
+        for e in graph.get_incident_edges(v):
+            d = labels[index[e.oposite(v)]]
+            if c != d and dag.get_edges_frompair(nodes[c], nodes[d]) is None:
+                dag.insert_edge(nodes[c], nodes[d])
+
+    return dag, labels
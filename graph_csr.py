@@ -0,0 +1,495 @@
+from array import array
+from collections import deque
+from heapq import heappush, heappop
+import json
+import mmap as _mmap
+from multiprocessing import Pool
+from numbers import Real
+import struct
+import sys
+
+
+def _weight(key) -> float:
+    """Edge keys that are not numbers are frozen as unit weight"""
+    if isinstance(key, Real):
+        return float(key)
+    return 1.0
+
+
+# file layout, little endian and every section aligned to 8 bytes:
+# header, vertex key table (JSON, "null" for plain integer ids),
+# offsets q[n + 1], targets i[m], weights d[m], then the same three
+# arrays of incoming edges for directed graphs
+_MAGIC = b"GCSR"
+_FORMAT = 1
+_HEADER = struct.Struct("<4sIIqqqq")  # magic, format, directed, n, m out, m in, key bytes
+
+
+def _padded(size: int) -> int:
+    return (size + 7) // 8 * 8
+
+
+def _little_endian(section):
+    """section itself on little endian hosts, else a byteswapped array copy"""
+    if sys.byteorder == "little":
+        return section
+    section = array(getattr(section, "typecode", None) or section.format, section)
+    section.byteswap()
+    return section
+
+
+class CSRGraph:
+    """Read-only compressed-sparse-row snapshot of a Graph.
+
+    Vertices are integer ids 0..n-1 in the order of Graph.get_vertices().
+    The out-edges of vertex i are targets[offsets[i]:offsets[i + 1]],
+    with matching weights. Undirected graphs share one set of arrays for
+    incoming and outgoing edges, as Graph does with _out and _in_.
+    """
+
+    def __init__(self, vertices, offsets, targets, weights,
+                 in_offsets=None, in_targets=None, in_weights=None, directed=False) -> None:
+        """Do not call constructor directly. Use Graph s freeze()."""
+        self._vertices = vertices  # id -> original vertex (or key)
+        self._index = None  # lazily built original vertex -> id
+        self._path = None  # file the arrays are memory mapped from
+
+        self._offsets = offsets
+        self._targets = targets
+        self._weights = weights
+
+        self._directed = directed
+        if directed:
+            self._in_offsets = in_offsets
+            self._in_targets = in_targets
+            self._in_weights = in_weights
+        else:
+            self._in_offsets = offsets
+            self._in_targets = targets
+            self._in_weights = weights
+
+    @classmethod
+    def from_graph(cls, graph):
+        vertices = list(graph.get_vertices())
+        index = dict()
+        for i, v in enumerate(vertices):
+            index[v] = i
+
+        def pack(outgoing):
+            offsets = array("q", [0])
+            targets = array("i")
+            weights = array("d")
+            for v in vertices:
+                for e in graph.get_incident_edges(v, outgoing):
+                    targets.append(index[e.oposite(v)])
+                    weights.append(_weight(e._key))
+                offsets.append(len(targets))
+
+            return offsets, targets, weights
+
+        offsets, targets, weights = pack(True)
+        if graph.is_directed():
+            in_offsets, in_targets, in_weights = pack(False)
+        else:
+            in_offsets = in_targets = in_weights = None
+
+        csr = cls(vertices, offsets, targets, weights,
+                  in_offsets, in_targets, in_weights, graph.is_directed())
+        csr._index = index
+        return csr
+
+    @classmethod
+    def from_adjacency(cls, n: int, adjacent, directed=False, vertices=None):
+        """Build from a callable where adjacent(v) yields (neighbour id, weight) pairs"""
+        offsets = array("q", [0])
+        targets = array("i")
+        weights = array("d")
+        for v in range(n):
+            for u, w in adjacent(v):
+                targets.append(u)
+                weights.append(_weight(w))
+            offsets.append(len(targets))
+
+        csr = cls(range(n) if vertices is None else vertices, offsets, targets, weights)
+        if directed:
+            csr._directed = True
+            csr._in_offsets, csr._in_targets, csr._in_weights = csr._transpose()
+
+        return csr
+
+    def _transpose(self):
+        # counting sort of the edges by target
+        n = self.vertex_count()
+        offsets, targets, weights = self._offsets, self._targets, self._weights
+        in_offsets = array("q", [0]) * (n + 1)
+        for u in targets:
+            in_offsets[u + 1] += 1
+        for v in range(n):
+            in_offsets[v + 1] += in_offsets[v]
+
+        fill = array("q", in_offsets[:n])
+        in_targets = array("i", [0]) * len(targets)
+        in_weights = array("d", [0.0]) * len(targets)
+        for v in range(n):
+            for i in range(offsets[v], offsets[v + 1]):
+                u = targets[i]
+                in_targets[fill[u]] = v
+                in_weights[fill[u]] = weights[i]
+                fill[u] += 1
+
+        return in_offsets, in_targets, in_weights
+
+    """ STORAGE """
+
+    def _keys(self):
+        if isinstance(self._vertices, range):
+            return None
+        return [v.get_key() if hasattr(v, "get_key") else v for v in self._vertices]
+
+    def save(self, path) -> None:
+        """Write the binary graph file, vertex keys have to be JSON values"""
+        key_bytes = json.dumps(self._keys()).encode()
+        sections = [self._offsets, self._targets, self._weights]
+        if self._directed:
+            sections += [self._in_offsets, self._in_targets, self._in_weights]
+
+        with open(path, "wb") as file:
+            def write(data):
+                data = bytes(data)
+                file.write(data)
+                file.write(bytes(_padded(len(data)) - len(data)))
+
+            write(_HEADER.pack(_MAGIC, _FORMAT, self._directed, self.vertex_count(),
+                               len(self._targets), len(self._in_targets), len(key_bytes)))
+            write(key_bytes)
+            for section in sections:
+                write(_little_endian(section))
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Read a file written by save.
+
+        With mmap=True the arrays are read-only memoryviews over a shared
+        memory map of the file, nothing is copied and processes loading the
+        same file share the OS page cache. numpy.frombuffer can wrap them
+        without a copy as well. The file is little endian, big endian hosts
+        always get byteswapped array copies.
+        """
+        mmap = mmap and sys.byteorder == "little"
+        with open(path, "rb") as file:
+            if mmap:
+                data = memoryview(_mmap.mmap(file.fileno(), 0, access=_mmap.ACCESS_READ))
+            else:
+                data = memoryview(file.read())
+
+        magic, version, directed, n, m, m_in, key_size = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _FORMAT:
+            raise ValueError(f"{path} is not a graph file of format {_FORMAT}")
+
+        position = _padded(_HEADER.size)
+        keys = json.loads(bytes(data[position:position + key_size]))
+        position += _padded(key_size)
+
+        def take(typecode, count):
+            nonlocal position
+            size = count * struct.calcsize(typecode)
+            section = data[position:position + size]
+            position += _padded(size)
+            if mmap:
+                return section.cast(typecode)
+            section = array(typecode, section.tobytes())
+            if sys.byteorder == "big":
+                section.byteswap()
+            return section
+
+        offsets, targets, weights = take("q", n + 1), take("i", m), take("d", m)
+        if directed:
+            in_arrays = take("q", n + 1), take("i", m_in), take("d", m_in)
+        else:
+            in_arrays = None, None, None
+
+        vertices = range(n) if keys is None else keys
+        csr = cls(vertices, offsets, targets, weights, *in_arrays, bool(directed))
+        if mmap:
+            csr._path = path
+        return csr
+
+    def _shareable(self):
+        """What a pool worker rebuilds the out-edges from, see _reopen.
+
+        Memoryviews over a memory map can not be pickled, workers open the
+        file again instead and share its pages. Other graphs are sent as
+        their arrays, without the vertex objects.
+        """
+        if self._path is not None:
+            return self._path
+        return CSRGraph(None, self._offsets, self._targets, self._weights)
+
+    """ ULILITY """
+
+    def is_directed(self):
+        return self._directed
+
+    def vertex_count(self):
+        return len(self._offsets) - 1
+
+    def edge_counts(self):
+        total = len(self._targets)
+        if self.is_directed():
+            return total
+
+        # an undirected loop is stored once, every other edge twice
+        offsets, targets = self._offsets, self._targets
+        loops = 0
+        for v in range(self.vertex_count()):
+            for i in range(offsets[v], offsets[v + 1]):
+                if targets[i] == v:
+                    loops += 1
+        return (total + loops) // 2
+
+    def vertex(self, i):
+        """Return the original vertex for id i"""
+        return self._vertices[i]
+
+    def vertex_id(self, v):
+        """Return the integer id of an original vertex"""
+        if self._index is None:
+            self._index = dict()
+            for i, u in enumerate(self._vertices):
+                self._index[u] = i
+
+        return self._index[v]
+
+    def get_vertices(self):
+        return range(self.vertex_count())
+
+    def get_degree(self, v, outgoing=True):
+        offsets = self._offsets if outgoing else self._in_offsets
+        return offsets[v + 1] - offsets[v]
+
+    def get_adjacent(self, v, outgoing=True):
+        """Yield (neighbour id, weight) pairs of vertex id v"""
+        if outgoing:
+            offsets, targets, weights = self._offsets, self._targets, self._weights
+        else:
+            offsets, targets, weights = self._in_offsets, self._in_targets, self._in_weights
+
+        for i in range(offsets[v], offsets[v + 1]):
+            yield targets[i], weights[i]
+
+    """ TRAVERSAL """
+
+    def DFS(self, start):
+        """Deapth First Search from vertex id start.
+
+        Returns:
+            array: parent id of each vertex, -1 when unreached, start for itself
+        """
+        offsets, targets = self._offsets, self._targets
+        parent = array("i", [-1]) * self.vertex_count()
+        parent[start] = start
+
+        # each frame is (vertex, next position in targets), so the walk
+        # follows the same order as the recursive version
+        stack = [(start, offsets[start])]
+        while stack:
+            v, i = stack[-1]
+            if i == offsets[v + 1]:
+                stack.pop()
+                continue
+
+            stack[-1] = (v, i + 1)
+            u = targets[i]
+            if parent[u] == -1:
+                parent[u] = v
+                stack.append((u, offsets[u]))
+
+        return parent
+
+    def BFS(self, start):
+        """Breadth First Search from vertex id start.
+
+        Returns:
+            array: parent id of each vertex, -1 when unreached, start for itself
+        """
+        offsets, targets = self._offsets, self._targets
+        parent = array("i", [-1]) * self.vertex_count()
+        parent[start] = start
+
+        queue = deque([start])
+        while queue:
+            v = queue.popleft()
+            for i in range(offsets[v], offsets[v + 1]):
+                u = targets[i]
+                if parent[u] == -1:
+                    parent[u] = v
+                    queue.append(u)
+
+        return parent
+
+    def construct_path(self, start, end, parent):
+        """Get path of ids from start to end out of a DFS/BFS/dijkstra parent array"""
+        path = list()
+        if parent[end] != -1:
+            path.append(end)
+            walk = end
+            while walk != start:
+                walk = parent[walk]
+                path.append(walk)
+
+            path.reverse()
+
+        return path
+
+    """ SHOARTEST PATH """
+
+    def dijkstra(self, start, end=None, outgoing=True):
+        """Single source shortest distances from vertex id start.
+
+        Stops as soon as end is settled when it is given, end may also be a
+        collection of ids that all have to be settled. With outgoing=False
+        the search walks incoming edges, i.e. distances towards start.
+
+        Returns:
+            tuple: (dist, parent) arrays, dist is inf and parent -1 when unreached
+        """
+        if outgoing:
+            offsets, targets, weights = self._offsets, self._targets, self._weights
+        else:
+            offsets, targets, weights = self._in_offsets, self._in_targets, self._in_weights
+        n = self.vertex_count()
+        dist = array("d", [float("inf")]) * n
+        parent = array("i", [-1]) * n
+        settled = bytearray(n)
+        if end is None:
+            pending = None
+        elif isinstance(end, int):
+            pending = {end}
+        else:
+            pending = set(end)
+
+        dist[start] = 0
+        parent[start] = start
+        heap = [(0.0, start)]
+        while heap:
+            d, v = heappop(heap)
+            if settled[v]:
+                continue  # stale entry
+            settled[v] = 1
+            if pending is not None:
+                pending.discard(v)
+                if not pending:
+                    break
+
+            for i in range(offsets[v], offsets[v + 1]):
+                u = targets[i]
+                nd = d + weights[i]
+                if nd < dist[u]:
+                    dist[u] = nd
+                    parent[u] = v
+                    heappush(heap, (nd, u))
+
+        return dist, parent
+
+    def distance_matrix(self, sources, targets=None, workers: int = 1):
+        """Shortest distances from every source id to every target id.
+
+        With workers > 1 the searches run in a multiprocessing pool, each
+        worker gets one copy of the offset/target/weight arrays when it starts.
+
+        Returns:
+            list: one array("d") row per source, inf where a target is unreached
+        """
+        if targets is None:
+            targets = range(self.vertex_count())
+        targets = array("i", targets)
+
+        if workers <= 1:
+            return [_target_distances(self, targets, s) for s in sources]
+
+        sources = list(sources)
+        chunksize = max(1, len(sources) // (workers * 4))
+        with Pool(workers, _init_worker, (self._shareable(), targets)) as pool:
+            return pool.map(_distance_row, sources, chunksize)
+
+    """ SHOREST SPANNING TREE """
+
+    def MST_prim(self):
+        """Minimum spanning forest with Prim s algorithm.
+
+        Returns:
+            array: parent id of each vertex in the forest, -1 for roots
+        """
+        offsets, targets, weights = self._offsets, self._targets, self._weights
+        n = self.vertex_count()
+        dist = array("d", [float("inf")]) * n
+        parent = array("i", [-1]) * n
+        in_tree = bytearray(n)
+
+        for root in range(n):
+            if in_tree[root]:
+                continue
+
+            dist[root] = 0
+            heap = [(0.0, root)]
+            while heap:
+                _, v = heappop(heap)
+                if in_tree[v]:
+                    continue
+                in_tree[v] = 1
+
+                for i in range(offsets[v], offsets[v + 1]):
+                    u = targets[i]
+                    if not in_tree[u] and weights[i] < dist[u]:
+                        dist[u] = weights[i]
+                        parent[u] = v
+                        heappush(heap, (weights[i], u))
+
+        return parent
+
+    """ TOPOLICICAL ORDER, ACYLIC TREE """
+
+    def topological_sort(self):
+        """Kahn s algorithm, the order is shorter than vertex_count() on a cycle"""
+        offsets, targets = self._offsets, self._targets
+        n = self.vertex_count()
+        in_deg = array("q", [self.get_degree(v, outgoing=False) for v in range(n)])
+
+        order = array("i")
+        zero_deg = deque(v for v in range(n) if in_deg[v] == 0)
+        while zero_deg:
+            v = zero_deg.popleft()
+            order.append(v)
+            for i in range(offsets[v], offsets[v + 1]):
+                u = targets[i]
+                in_deg[u] -= 1
+                if in_deg[u] == 0:
+                    zero_deg.append(u)
+
+        return order
+
+
+""" POOL WORKER """
+
+_shared = None  # (CSRGraph, target ids) of the current process
+
+
+def _reopen(shareable) -> CSRGraph:
+    """Inverse of CSRGraph._shareable, run in the worker"""
+    if isinstance(shareable, CSRGraph):
+        return shareable
+    return CSRGraph.load(shareable)
+
+
+def _init_worker(shareable, targets):
+    global _shared
+    _shared = (_reopen(shareable), targets)
+
+
+def _target_distances(csr, targets, source):
+    dist, _ = csr.dijkstra(source, targets)
+    return array("d", [dist[t] for t in targets])
+
+
+def _distance_row(source):
+    return _target_distances(*_shared, source)
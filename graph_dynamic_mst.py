@@ -0,0 +1,267 @@
+class LinkCutTree:
+    """Forest of rooted trees over integer nodes with path maximum queries.
+
+    Every node carries a weight and each preferred path is kept in a splay
+    tree, so link, cut and path queries take O(log n) amortized time.
+    All operations are iterative.
+    """
+
+    def __init__(self) -> None:
+        self._left = list()
+        self._right = list()
+        self._parent = list()  # splay parent, or path parent for a splay root
+        self._rev = bytearray()  # pending reversal of the children
+        self._weight = list()
+        self._max = list()  # node of largest weight in the splay subtree
+
+    def add_node(self, weight=float("-inf")) -> int:
+        self._left.append(-1)
+        self._right.append(-1)
+        self._parent.append(-1)
+        self._rev.append(0)
+        self._weight.append(weight)
+        self._max.append(len(self._max))
+        return len(self._max) - 1
+
+    def reset_node(self, x: int, weight) -> None:
+        """Reuse a node that has been cut from every neighbour"""
+        self._left[x] = self._right[x] = self._parent[x] = -1
+        self._rev[x] = 0
+        self._weight[x] = weight
+        self._max[x] = x
+
+    """ PRIVATE """
+
+    def _is_root(self, x):
+        p = self._parent[x]
+        return p == -1 or (self._left[p] != x and self._right[p] != x)
+
+    def _push(self, x):
+        if self._rev[x]:
+            left, right = self._right[x], self._left[x]
+            self._left[x], self._right[x] = left, right
+            if left != -1:
+                self._rev[left] ^= 1
+            if right != -1:
+                self._rev[right] ^= 1
+            self._rev[x] = 0
+
+    def _pull(self, x):
+        best = x
+        weight, mx = self._weight, self._max
+        for child in (self._left[x], self._right[x]):
+            if child != -1 and weight[mx[child]] > weight[best]:
+                best = mx[child]
+        mx[x] = best
+
+    def _rotate(self, x):
+        left, right, parent = self._left, self._right, self._parent
+        p = parent[x]
+        g = parent[p]
+        if not self._is_root(p):
+            if left[g] == p:
+                left[g] = x
+            else:
+                right[g] = x
+        parent[x] = g
+
+        if left[p] == x:
+            left[p] = right[x]
+            if right[x] != -1:
+                parent[right[x]] = p
+            right[x] = p
+        else:
+            right[p] = left[x]
+            if left[x] != -1:
+                parent[left[x]] = p
+            left[x] = p
+        parent[p] = x
+
+        self._pull(p)
+        self._pull(x)
+
+    def _splay(self, x):
+        # push pending reversals from the splay root down to x first
+        path = [x]
+        while not self._is_root(path[-1]):
+            path.append(self._parent[path[-1]])
+        for y in reversed(path):
+            self._push(y)
+
+        left, parent = self._left, self._parent
+        while not self._is_root(x):
+            p = parent[x]
+            if not self._is_root(p):
+                g = parent[p]
+                if (left[g] == p) == (left[p] == x):
+                    self._rotate(p)  # zig-zig
+                else:
+                    self._rotate(x)  # zig-zag
+            self._rotate(x)
+
+    def _access(self, x):
+        last = -1
+        y = x
+        while y != -1:
+            self._splay(y)
+            self._right[y] = last
+            self._pull(y)
+            last = y
+            y = self._parent[y]
+        self._splay(x)
+
+    def _make_root(self, x):
+        self._access(x)
+        self._rev[x] ^= 1
+
+    """ PUBLIC """
+
+    def find_root(self, x: int) -> int:
+        self._access(x)
+        while True:
+            self._push(x)
+            if self._left[x] == -1:
+                break
+            x = self._left[x]
+        self._splay(x)
+        return x
+
+    def connected(self, x: int, y: int) -> bool:
+        return x == y or self.find_root(x) == self.find_root(y)
+
+    def link(self, x: int, y: int) -> None:
+        """Add tree edge x - y, they must be in different trees"""
+        self._make_root(x)
+        self._parent[x] = y
+
+    def cut(self, x: int, y: int) -> None:
+        """Remove tree edge x - y"""
+        self._make_root(x)
+        self._access(y)
+        # the path is x, y so x is the whole left subtree of y
+        self._parent[x] = -1
+        self._left[y] = -1
+        self._pull(y)
+
+    def path_max(self, x: int, y: int) -> int:
+        """Node of largest weight on the tree path x - y"""
+        self._make_root(x)
+        self._access(y)
+        return self._max[y]
+
+
+class IncrementalMST:
+    """Minimum spanning forest of an undirected Graph that keeps gaining edges.
+
+    Vertices and edges have to be added through this object, it inserts them
+    into the graph and updates the forest. A new edge u - v either joins two
+    trees or replaces the heaviest edge on the tree path u - v when it is
+    lighter, which takes O(log n) amortized time with a link-cut tree.
+    Edge keys are the weights. Each tree edge is a node of its own in the
+    link-cut tree, placed between its endpoints.
+    """
+
+    def __init__(self, graph) -> None:
+        if graph.is_directed():
+            raise ValueError("Spanning trees need an undirected graph")
+
+        self._graph = graph
+        self._lct = LinkCutTree()
+        self._node = dict()  # vertex -> node
+        self._edge_of = dict()  # node of a tree edge -> edge
+        self._pair = dict()  # (u, v) and (v, u) -> node of the tree edge between them
+        self._free = list()  # nodes of edges that left the tree
+        self._weight = 0
+
+        for v in graph.get_vertices():
+            self._node[v] = self._lct.add_node()
+        for e in graph.MST_krusal():
+            self._link(e)
+
+        self._version = graph.version()
+
+    """ PRIVATE """
+
+    def _check_version(self):
+        if self._graph.version() != self._version:
+            raise ValueError("Graph changed outside IncrementalMST, build it again")
+
+    def _link(self, e):
+        u, v = e.endpoints()
+        if self._free:
+            x = self._free.pop()
+            self._lct.reset_node(x, e._key)
+        else:
+            x = self._lct.add_node(e._key)
+
+        self._lct.link(self._node[u], x)
+        self._lct.link(x, self._node[v])
+        self._edge_of[x] = e
+        self._pair[(u, v)] = self._pair[(v, u)] = x
+        self._weight += e._key
+
+    def _cut(self, x):
+        e = self._edge_of.pop(x)
+        u, v = e.endpoints()
+        self._lct.cut(self._node[u], x)
+        self._lct.cut(x, self._node[v])
+        del self._pair[(u, v)]
+        del self._pair[(v, u)]
+        self._free.append(x)
+        self._weight -= e._key
+        return e
+
+    """ PUBLIC """
+
+    def insert_vertex(self, key=None):
+        self._check_version()
+        v = self._graph.insert_vertex(key)
+        self._node[v] = self._lct.add_node()
+        self._version = self._graph.version()
+        return v
+
+    def insert_edge(self, start, end, key):
+        """Insert edge into the graph and return the tree edge it pushed out, if any"""
+        self._check_version()
+        old = self._graph.get_edges_frompair(start, end)
+        if old is not None and not key < old._key:
+            raise ValueError("The pair already has a lighter edge, only decreases are supported")
+
+        e = self._graph.insert_edge(start, end, key)
+        self._version = self._graph.version()
+        if start is end:
+            return None  # a loop never joins a spanning tree
+
+        # the replaced edge is gone from the graph, drop it from the tree too
+        if (start, end) in self._pair:
+            removed = self._cut(self._pair[(start, end)])
+            self._link(e)
+            return removed
+
+        u, v = self._node[start], self._node[end]
+        if not self._lct.connected(u, v):
+            self._link(e)
+            return None
+
+        x = self._lct.path_max(u, v)
+        if x in self._edge_of and key < self._edge_of[x]._key:
+            removed = self._cut(x)
+            self._link(e)
+            return removed
+
+        return None
+
+    def tree_edges(self):
+        return list(self._edge_of.values())
+
+    def total_weight(self):
+        return self._weight
+
+    def connected(self, u, v) -> bool:
+        return self._lct.connected(self._node[u], self._node[v])
+
+    def heaviest_edge(self, u, v):
+        """Heaviest tree edge on the path u - v, None if not connected"""
+        if u is v or not self.connected(u, v):
+            return None
+        return self._edge_of[self._lct.path_max(self._node[u], self._node[v])]
@@ -1,10 +1,85 @@
+from collections import deque
+from heapq import heappush, heappop
+from operator import index
+from graph_csr import CSRGraph
+import graph_johnson
+import graph_coloring
+
+# Graph.dijkstra / Graph.prim use the NumPy engine from this many vertices
+# and this share of the n * n possible edges. The matrix storage needs more,
+# converting it to NumPy reads every cell, edge or not.
+DENSE_MIN_SIZE = 64
+DENSE_MIN_DENSITY = 0.1
+MATRIX_MIN_DENSITY = 0.3
+
+
+def _as_list(values) -> list:
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+class _SparseRow(dict):
+    """Adjacency row of a sparse Graph that reads like a dense row: it has
+    one column per vertex, missing columns are None, columns out of range
+    raise IndexError and storing None removes the edge. Iterating, len and
+    "in" go over the columns as well. Only the edges are stored, keys(),
+    values() and items() see just those."""
+
+    __slots__ = "_size",
+
+    def __init__(self, size: int) -> None:
+        super().__init__()
+        self._size = size
+
+    def _column(self, key) -> int:
+        column = index(key)
+        if column < 0:
+            column += self._size
+        if not 0 <= column < self._size:
+            raise IndexError("row index out of range")
+        return column
+
+    def __missing__(self, key):
+        # stored columns are in range and not negative, anything else lands here
+        column = self._column(key)
+        return None if column == key else dict.get(self, column)
+
+    def __setitem__(self, key, value):
+        column = self._column(key)
+        if value is None:
+            self.pop(column, None)
+        else:
+            super().__setitem__(column, value)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        for column in range(self._size):
+            yield dict.get(self, column)
+
+    def __reversed__(self):
+        for column in reversed(range(self._size)):
+            yield dict.get(self, column)
+
+    def __contains__(self, value) -> bool:
+        if value is None:
+            return len(self.keys()) < self._size
+        return value in self.values()
+
+
 class Graph:
-    def __init__(self, size: int, directed: bool = False) -> None:
-        self._out: list[list[int | None]] = [
-            [None for i in range(size)] for j in range(size)
-        ]
+    def __init__(self, size: int, directed: bool = False, sparse: bool = False) -> None:
+        """sparse=True keeps one dictionary of neighbours per vertex instead of a
+        size x size matrix, memory and neighbour scans then grow with the edges."""
+        if sparse:
+            self._out: list[_SparseRow] = [_SparseRow(size) for j in range(size)]
+        else:
+            self._out: list[list[int | None]] = [
+                [None for i in range(size)] for j in range(size)
+            ]
 
         self._directed = directed
+        self._sparse = sparse
 
     """ PROTECTED """
 
@@ -18,6 +93,10 @@ class Graph:
     def directed(self):
         return self._directed
 
+    @property
+    def sparse(self):
+        return self._sparse
+
     def __getitem__(self, item: int) -> list[int | None]:
         return self._out[item]
 
@@ -29,16 +108,54 @@ class Graph:
         if not self.directed:
             self[end][start] = self[start][end]
 
+    def freeze(self) -> CSRGraph:
+        """Return a read-only CSRGraph snapshot, vertex ids stay the same"""
+        return CSRGraph.from_adjacency(
+            len(self), lambda v: ((u, self[v][u]) for u in self.get_adjacent_vertex(v)), self.directed)
+
+    def save(self, path) -> None:
+        """Write the graph to a binary CSR file, see CSRGraph.save"""
+        self.freeze().save(path)
+
+    @classmethod
+    def load(cls, path, mmap: bool = True, sparse: bool = False) -> "Graph":
+        """Rebuild a graph from a file written by save.
+
+        For read-only use CSRGraph.load(path) maps the file without building anything.
+        """
+        csr = CSRGraph.load(path, mmap)
+        g = cls(csr.vertex_count(), csr.is_directed(), sparse)
+        for v in csr.get_vertices():
+            for u, weight in csr.get_adjacent(v):
+                g[v][u] = int(weight) if weight.is_integer() else weight
+
+        return g
+
     """ COUNT """
 
     def degree(self, vertex: int) -> int:
+        if self.sparse:
+            return len(self[vertex].keys())
+
         deg = 0
-        for u in self[vertex]:
-            if self[vertex][u] is not None:
+        for e in self[vertex]:
+            if e is not None:
                 deg += 1
 
         return deg
 
+    def density(self, samples: int = 32) -> float:
+        """Share of the n * n possible edges that exist, estimated from
+        `samples` evenly spaced rows for the matrix storage"""
+        n = len(self)
+        if n == 0:
+            return 0.0
+        if self.sparse:
+            return sum(len(row.keys()) for row in self._out) / (n * n)
+
+        rows = range(0, n, max(1, n // samples))
+        return sum(self.degree(v) for v in rows) / (len(rows) * n)
+
     """ ITERATE """
 
     def get_vertex(self):
@@ -46,12 +163,16 @@ class Graph:
             yield v
 
     def get_incident_edge(self, start: int = 0):
-        for end in range(len(self)):
-            if self[start][end] is not None:
-                yield self[start][end]
+        for end in self.get_adjacent_vertex(start):
+            yield self[start][end]
 
     def get_adjacent_vertex(self, start: int = 0):
-        for end in range(len(self[start])):
+        """Neighbours of start in increasing order"""
+        if self.sparse:
+            yield from sorted(self[start].keys())
+            return
+
+        for end in range(len(self)):
             if self[start][end] is not None:
                 yield end
 
@@ -60,164 +181,346 @@ class Graph:
     def DFS_ordered(self, start: int) -> list[int]:
         stack = [start]
         path = list()
+        visited = bytearray(len(self))
 
         while stack:
             v = stack.pop(-1)
 
-            if v not in path:
+            if not visited[v]:
+                visited[v] = 1
                 path.append(v)
 
-                next_level = [
-                    u for u in self.get_adjacent_vertex(v) if u not in path]
-                next_level.sort()
-                stack += next_level
+                # neighbours come sorted, so the largest one is walked first
+                stack += [u for u in self.get_adjacent_vertex(v) if not visited[u]]
 
         return path
 
     def BFS_ordered(self, start: int) -> list[int]:
         path = list()
+        visited = bytearray(len(self))
 
-        queue = [start]
+        queue = deque([start])
         while queue:
-            v = queue.pop(0)
+            v = queue.popleft()
 
-            if v not in path:
+            if not visited[v]:
+                visited[v] = 1
                 path.append(v)
 
-                next_level = [
-                    u for u in self.get_adjacent_vertex(v) if u not in path]
-                next_level.sort()
-
-                queue += next_level
+                queue += [u for u in self.get_adjacent_vertex(v) if not visited[u]]
 
         return path
 
-    """ SHORTEST PATH """
+    def vectorized(self):
+        """Return a NumPy VectorGraph snapshot for whole-level traversals"""
+        from graph_vectorized import VectorGraph  # needs NumPy, only loaded when used
 
-    def shortest_distance_djikstra(self, start: int = 0) -> list[float]:
-        dist = [float("inf") for i in range(len(self._out))]
-        dist[start] = 0
+        return VectorGraph(self)
 
-        # vertices is the index
-        # so that we can get the index as vertices
-        min_list = [i for i in range(len(self))]  # list of vertices
-        while min_list:
-            v = min(min_list, key=lambda v: dist[v])
-            min_list.remove(v)
+    """ SHORTEST PATH """
 
+    def _engine(self, engine: str) -> str:
+        # dense NumPy scans win once a row holds a good share of the vertices
+        if engine not in ("auto", "heap", "dense"):
+            raise ValueError(f"Unknown engine {engine!r}, expected 'auto', 'heap' or 'dense'")
+        if engine != "auto":
+            return engine
+
+        if len(self) < DENSE_MIN_SIZE:
+            return "heap"
+        if self.density() < (DENSE_MIN_DENSITY if self.sparse else MATRIX_MIN_DENSITY):
+            return "heap"
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            return "heap"
+        return "dense"
+
+    def _heap_search(self, start: int, prim: bool):
+        dist = [float("inf") for i in range(len(self))]
+        pred = [-1 for i in range(len(self))]
+        done = bytearray(len(self))
+        dist[start] = 0.0  # floats like the dense engine, whatever the weight types
+
+        heap = [(0.0, start)]
+        while heap:
+            d, v = heappop(heap)
+            if done[v]:
+                continue  # stale entry
+            done[v] = 1
+
+            row = self[v]
             for u in self.get_adjacent_vertex(v):
-                if u in min_list and dist[u] > dist[v] + self[v][u]:
-                    dist[u] = dist[v] + self[v][u]
+                key = float(row[u]) if prim else d + row[u]
+                if not done[u] and key < dist[u]:
+                    dist[u] = key
+                    pred[u] = v
+                    heappush(heap, (key, u))
 
-        return dist
+        return dist, pred
 
-    # instead of musing two list: min_vertex and distance to
-    # which fform a key_value pair, should use a
-    # dict from vertex to distance, and a
-    # shortest path list map index as vertex to distance
-    def MST_prim(self, start: int = 0) -> list[float]:  # list of vertex
-        dist = [float("inf") for i in range(len(self))]
-        dist[start] = 0
+    def _search(self, start: int, prim: bool, engine: str):
+        if self._engine(engine) == "heap":
+            return self._heap_search(start, prim)
 
-        min_vertex = [i for i in range(len(self))]  # list of vertices
-        while min_vertex:
-            v = min(min_vertex, key=lambda v: dist[v])
-            min_vertex.remove(v)
+        from graph_vectorized import weight_matrix, dense_search  # needs NumPy
 
-            for u in self.get_adjacent_vertex(v):
-                e = self[v][u]  # get edge
+        # lists like the heap engine, whichever engine auto picks
+        dist, pred = dense_search(weight_matrix(self), start, prim)
+        return _as_list(dist), _as_list(pred)
 
-                if u in min_vertex and e is not None and e < dist[u]:
-                    dist[u] = e
+    def dijkstra(self, start: int = 0, engine: str = "auto"):
+        """Single source shortest distances from start.
 
-        return dist
+        Args:
+            engine (str): "heap" (binary heap, for sparse graphs), "dense"
+                (NumPy argmin over a weight matrix) or "auto" to pick one
+                from the size and density of the graph
 
-    """ ONE-TIME PATH """
+        Returns:
+            tuple: (dist, pred) lists indexed by vertex, dist is inf and pred -1
+                when unreached, pred of start is -1. Distances are floats and pred
+                ints with either engine
+        """
+        return self._search(start, False, engine)
 
-    def floywarshall_shortest_distance(self):
-        dist = [[float("inf") for i in range(len(self))]
-                for j in range(len(self))]
-        for v in self.get_vertex():
-            for u in self.get_vertex():
-                dist[u][v] = self[u][v]
+    def prim(self, start: int = 0, engine: str = "auto"):
+        """Minimum spanning tree of the component of start with Prim s algorithm.
 
-        for v in self.get_vertex():
-            dist[v][v] = 0
+        Returns:
+            tuple: (weight, pred) where weight is the tree edge joining each
+                vertex to pred, see dijkstra for the engines and conventions
+        """
+        return self._search(start, True, engine)
 
-        for k in range(len(self)):
-            for i in range(len(self)):
-                for j in range(len(self)):
-                    if dist[i][j] > dist[i][k] + dist[k][j]:
-                        dist[i][j] = dist[i][k] + dist[k][j]
+    def shortest_distance_djikstra(self, start: int = 0) -> list[float]:
+        """Distances from start as floats, whichever engine auto picks"""
+        dist, _ = self.dijkstra(start)
+        return dist
 
+    def MST_prim(self, start: int = 0) -> list[float]:  # list of vertex
+        """Tree edge weight of every vertex as floats, whichever engine auto picks"""
+        dist, _ = self.prim(start)
         return dist
 
-    def floywarshall_path_reconstruction(self):
-        dist = [[float("inf") for i in range(len(self))]
-                for j in range(len(self))]
-        prev = [[None for i in range(len(self))] for j in range(len(self))]
+    """ ONE-TIME PATH """
 
-        for v in self.get_vertex():
-            for u in self.get_vertex():
-                dist[u][v] = self[u][v]
-                prev[u][v] = u
+    def floyd_warshall(self, block: int = 32):
+        """All pairs shortest paths with NumPy, see graph_vectorized.floyd_warshall.
+
+        Returns:
+            ShortestPaths: dist matrix, next_hop matrix and path(i, j)
+        """
+        from graph_vectorized import weight_matrix, floyd_warshall  # needs NumPy
+
+        return floyd_warshall(weight_matrix(self), block)
+
+    def johnson(self, sources=None, workers: int = 1):
+        """All pairs shortest distances for sparse graphs with negative edges,
+        streamed as (source, array("d") row), see graph_johnson.johnson"""
+        return graph_johnson.johnson(self.freeze(), sources, workers)
+
+    def _floywarshall(self):
+        inf = float("inf")
+        dist = [[inf if self[v][u] is None else self[v][u] for u in self.get_vertex()]
+                for v in self.get_vertex()]
+        prev = [[None if e == inf else v for e in dist[v]] for v in self.get_vertex()]
 
         for v in self.get_vertex():
-            dist[v][v] = 0
+            if dist[v][v] > 0:
+                dist[v][v] = 0
+            prev[v][v] = None
 
         for k in range(len(self)):
+            row_k, prev_k = dist[k], prev[k]
             for i in range(len(self)):
+                row_i = dist[i]
+                d_ik = row_i[k]
+                if d_ik == inf:
+                    continue  # k does not help any path from i
+
                 for j in range(len(self)):
-                    if dist[i][j] > dist[i][k] + dist[k][j]:
-                        dist[i][j] = dist[i][k] + dist[k][j]
+                    if row_i[j] > d_ik + row_k[j]:
+                        row_i[j] = d_ik + row_k[j]
+                        prev[i][j] = prev_k[j]
+
+        return dist, prev
 
+    def floywarshall_shortest_distance(self):
+        dist, _ = self._floywarshall()
         return dist
 
+    def floywarshall_path_reconstruction(self):
+        """Returns (dist, prev), prev[i][j] is the vertex before j on a
+        shortest path from i, None when there is none or i == j"""
+        return self._floywarshall()
+
     def djiasktra_path_reconstruction(self, start: int = 0) -> dict[int:int]:
-        dist = [float("inf") for i in range(len(self))]
-        dist[start] = 0
+        _, pred = self.dijkstra(start)
         prev: dict[int:int] = dict()
-        for v in self.get_vertex():
-            prev[v] = None
+        for v, u in enumerate(pred):
+            prev[v] = None if u == -1 else u
 
-        min_vertex = [i for i in range(len(self))]  # list of vertices
-        while min_vertex:
-            v = min(min_vertex, key=lambda v: dist[v])
-            min_vertex.remove(v)
+        return prev
 
-            for u in self.get_adjacent_vertex(v):
-                e = self[v][u]  # get edge
+    def eulerian_cycle(self, start: int = 0):
+        """Hierholzer s algorithm, each edge is visited once.
 
-                if u in min_vertex and e is not None and e < dist[u]:
-                    dist[u] = e + dist[v]
-                    prev[u] = v
+        Returns:
+            iterator: (u, v) edges of a closed walk from start that uses every edge once
 
-        return prev
+        Raises:
+            ValueError: when the graph has no such walk
+        """
+        in_deg = [0 for i in range(len(self))]
+        out_deg = [0 for i in range(len(self))]
+        edge_count = 0
+        for v in self.get_vertex():
+            for u in self.get_adjacent_vertex(v):
+                out_deg[v] += 1
+                in_deg[u] += 1
+                if self.directed or u >= v:  # undirected edges are stored twice
+                    edge_count += 1
 
-    def eulerian_cycle(self, start: int = 0) -> dict[int:int]:
-        stack = [(start, None)]
-        path = dict()
+        for v in self.get_vertex():
+            if self.directed:
+                balanced = in_deg[v] == out_deg[v]
+            else:
+                # a loop is stored once but counts twice
+                balanced = (out_deg[v] + (self[v][v] is not None)) % 2 == 0
+            if not balanced:
+                raise ValueError(f"Graph has no Eulerian cycle, vertex {v} is unbalanced")
 
+        used = set()  # (u, v) of used edges, smaller end first when undirected
+        remaining = dict()  # vertex -> iterator over neighbours not yet tried
+        stack = [(start, None)]
+        trail = list()
         while stack:
-            v, used_e = stack.pop(-1)
-            for u in self.get_adjacent_vertex(v):
-                e = self[v][u]
-                if e not in path.values():
-                    stack.append((u, e))
-                    path[u] = e
+            v, via = stack[-1]
+            if v not in remaining:
+                remaining[v] = self.get_adjacent_vertex(v)
+
+            for u in remaining[v]:
+                edge = (v, u) if self.directed or v <= u else (u, v)
+                if edge not in used:
+                    used.add(edge)
+                    stack.append((u, (v, u)))
+                    break
+            else:
+                stack.pop()
+                if via is not None:
+                    trail.append(via)
 
-        return path
+        if len(trail) != edge_count:
+            raise ValueError("Graph has no Eulerian cycle, its edges are not connected to start")
+
+        return reversed(trail)
+
+    """ CONNECTIVITY """
+
+    def _undirected_adjacency(self) -> list[list[int]]:
+        # directed graphs are taken as their underlying undirected graph
+        if not self.directed:
+            return [[u for u in self.get_adjacent_vertex(v) if u != v] for v in self.get_vertex()]
+
+        adjacent = [set() for v in self.get_vertex()]
+        for v in self.get_vertex():
+            for u in self.get_adjacent_vertex(v):
+                if u != v:
+                    adjacent[v].add(u)
+                    adjacent[u].add(v)
+        return [sorted(row) for row in adjacent]
+
+    def biconnected(self):
+        """Articulation points, bridges and biconnected components in one
+        iterative Hopcroft-Tarjan depth first sweep, O(V + E).
+
+        Edge directions and self loops are ignored.
+
+        Returns:
+            tuple: (set of cut vertices, list of bridges (u, v) with u < v,
+                list of biconnected components as vertex sets)
+        """
+        adjacent = self._undirected_adjacency()
+        disc = [-1 for i in range(len(self))]  # discovery time
+        low = [0 for i in range(len(self))]  # earliest discovery reachable by one back edge
+        cut_vertices = set()
+        bridges = list()
+        components = list()
+        edges = list()  # tree and back edges of the component being built
+        time = 0
+
+        for root in self.get_vertex():
+            if disc[root] != -1:
+                continue
+
+            disc[root] = low[root] = time
+            time += 1
+            root_children = 0
+            stack = [(root, -1, iter(adjacent[root]))]
+            while stack:
+                v, parent, neighbours = stack[-1]
+                for u in neighbours:
+                    if disc[u] == -1:
+                        disc[u] = low[u] = time
+                        time += 1
+                        edges.append((v, u))
+                        stack.append((u, v, iter(adjacent[u])))
+                        break
+                    elif u != parent and disc[u] < disc[v]:  # back edge
+                        low[v] = min(low[v], disc[u])
+                        edges.append((v, u))
+                else:
+                    stack.pop()
+                    if not stack:
+                        break
+
+                    p = stack[-1][0]
+                    low[p] = min(low[p], low[v])
+                    if low[v] > disc[p]:
+                        bridges.append((min(p, v), max(p, v)))
+                    if low[v] >= disc[p]:  # p separates the subtree of v
+                        if p == root:
+                            root_children += 1
+                        else:
+                            cut_vertices.add(p)
+
+                        component = set()
+                        while True:
+                            a, b = edges.pop()
+                            component.add(a)
+                            component.add(b)
+                            if (a, b) == (p, v):
+                                break
+                        components.append(component)
+
+            if root_children > 1:
+                cut_vertices.add(root)
+
+        return cut_vertices, bridges, components
+
+    def articulation_points(self) -> list[int]:
+        cut_vertices, _, _ = self.biconnected()
+        return sorted(cut_vertices)
+
+    def bridges(self) -> list[tuple[int, int]]:
+        _, bridges, _ = self.biconnected()
+        return bridges
+
+    def biconnected_components(self) -> list[set[int]]:
+        _, _, components = self.biconnected()
+        return components
 
     """ PUBLIC """
 
     def get_shortest_path(self, start: int, end: int) -> list[int | None]:
         prev = self.djiasktra_path_reconstruction(start)
-        if prev[end] is None:
+        if end != start and prev[end] is None:
             return [None]
 
         path: list[int:int] = [end]  # start from end = prev[end]
-        while end := prev[end] is not None:
-            path.append(prev[end])
+        while (end := prev[end]) is not None:
+            path.append(end)
 
         path.reverse()
         return path
@@ -225,11 +528,7 @@ class Graph:
     def get_isolated_vertex(self):
         isolated_vertecies = list()
         for i in range(len(self._out)):
-            for e in self._out[i]:
-                if e is not None:
-                    break
-
-            else:
+            if self.degree(i) == 0:
                 isolated_vertecies.append(i)
 
         return isolated_vertecies
@@ -241,45 +540,22 @@ class Graph:
         else:
             return "There is a connected graph"
 
-    def graph_coloring(self, start: int = 0) -> list[set[int]]:
-        color_list: list[set[int]] = [None, None]
-
-        color_list[0] = set(v for v in self.get_adjacent_vertex(start))
-        color_list[1] = set(v for v in self.get_vertex()
-                            if v not in color_list[0])
-
-        i = -1  # loop start from 0
-        while (i := i + 1) < len(color_list):
-            color = color_list[i]
-            for v in color:
-                for u in self.get_adjacent_vertex(v):
-                    if u in color:  # u is adjacent and same color
-                        if color is color_list[-1]:  # if last color
-                            color_list.append(set())
+    def graph_coloring(self, start: int = 0, strategy: str = "dsatur") -> list[set[int]]:
+        """Proper colouring, color_list[c] is the set of vertices with colour c.
 
-                        color_list[i + 1].add(u)  # push to the next colors
+        Args:
+            start (int): vertex coloured first, it gets colour 0
+            strategy (str): "dsatur", "largest_first" or "smallest_last",
+                see graph_coloring.color
+        """
+        colors = graph_coloring.color(self._undirected_adjacency(), strategy, start)
+        color_list: list[set[int]] = [set() for c in range(max(colors, default=-1) + 1)]
+        for v, c in enumerate(colors):
+            color_list[c].add(v)
 
         return color_list
 
     def is_cut_vertex(self, vertex: int) -> bool:
-        """THIS WILL AFFECT THE GRAPH, PLEASE COPY
-        BEFORE USING THIS"""
-
-        # delete the edges
-        for u in self.get_adjacent_vertex(vertex):
-            self[vertex][u] = None
-            self[u][vertex] = None
-
-        start: int = int()  # make sure start is not vertex
-        for v in self.get_vertex():
-            if v != vertex:
-                start = v
-                break
-        else:
-            return True
-
-        closure = self.DFS_ordered(start)
-        print(closure)
-        if len(closure) + 1 != len(self):
-            return True
-        return False
+        """True if removing vertex splits its connected component, the graph is not changed"""
+        cut_vertices, _, _ = self.biconnected()
+        return vertex in cut_vertices
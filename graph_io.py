@@ -0,0 +1,50 @@
+import csv
+
+from graph import Graph
+
+
+def read_edge_chunks(path, delimiter: str = None, chunk_size: int = 100000,
+                     key_type=str, weight_type=float, header: bool = False):
+    """Read an edge list file lazily, chunk_size rows at a time.
+
+    Each row is "start, end" or "start, end, weight". The delimiter is a tab
+    for .tsv files and a comma otherwise, unless given.
+
+    Yields:
+        list: (start key, end key[, weight]) tuples, at most chunk_size of them
+    """
+    if delimiter is None:
+        delimiter = "\t" if str(path).endswith(".tsv") else ","
+
+    with open(path, newline="") as file:
+        reader = csv.reader(file, delimiter=delimiter)
+        if header:
+            next(reader, None)
+
+        chunk = list()
+        for row in reader:
+            if not row or row[0].startswith("#"):
+                continue
+            if len(row) > 2 and row[2] != "":
+                chunk.append((key_type(row[0]), key_type(row[1]), weight_type(row[2])))
+            else:
+                chunk.append((key_type(row[0]), key_type(row[1])))
+
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = list()
+
+        if chunk:
+            yield chunk
+
+
+def load_edge_list(path, directed=False, **options):
+    """Build a Graph from an edge list file, see read_edge_chunks for options.
+
+    Vertices are found afterwards with Graph.vertex(key).
+    """
+    g = Graph(directed)
+    for chunk in read_edge_chunks(path, **options):
+        g.insert_edges(chunk)
+
+    return g
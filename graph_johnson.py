@@ -0,0 +1,141 @@
+from array import array
+from collections import deque
+from multiprocessing import Pool
+
+from graph_csr import CSRGraph, _reopen
+from heap_piorityqueue import make_priority_queue
+
+
+def bellman_ford_potential(csr) -> array:
+    """Potential h with w(u, v) + h[u] - h[v] >= 0 for every edge of csr.
+
+    h is the distance from a virtual source joined to every vertex by a zero
+    weight edge, found with the queue based Bellman-Ford: only vertices whose
+    potential just dropped are scanned again.
+
+    Raises:
+        ValueError: when there is a negative cycle
+    """
+    offsets, targets, weights = csr._offsets, csr._targets, csr._weights
+    n = csr.vertex_count()
+    h = array("d", [0.0]) * n
+    hops = array("i", [1]) * n  # edges on the path from the virtual source
+    queued = bytearray(b"\x01") * n
+    queue = deque(range(n))
+
+    while queue:
+        v = queue.popleft()
+        queued[v] = 0
+        d = h[v]
+        for i in range(offsets[v], offsets[v + 1]):
+            u = targets[i]
+            if d + weights[i] < h[u]:
+                h[u] = d + weights[i]
+                hops[u] = hops[v] + 1
+                if hops[u] > n:  # a shortest path can not repeat a vertex
+                    raise ValueError("Graph has a negative cycle")
+                if not queued[u]:
+                    queued[u] = 1
+                    queue.append(u)
+
+    return h
+
+
+def reweight(csr, h) -> CSRGraph:
+    """Copy of the csr arrays with the non-negative weights w(u, v) + h[u] - h[v]"""
+    offsets, targets, weights = csr._offsets, csr._targets, csr._weights
+    reweighted = array("d", weights)
+    for v in range(csr.vertex_count()):
+        for i in range(offsets[v], offsets[v + 1]):
+            # rounding may leave -1e-16 where the exact value is 0
+            reweighted[i] = max(0.0, weights[i] + h[v] - h[targets[i]])
+
+    return CSRGraph(None, offsets, targets, reweighted)
+
+
+def dijkstra_row(csr, h, source: int, backend: str = "heapq") -> array:
+    """Distances from source in the original weights, Dijkstra runs on the
+    reweighted csr with a priority queue from heap_piorityqueue"""
+    offsets, targets, weights = csr._offsets, csr._targets, csr._weights
+    n = csr.vertex_count()
+    dist = array("d", [float("inf")]) * n
+    settled = bytearray(n)
+
+    q = make_priority_queue(backend)
+    q_pointer = {source: q.add(source, 0.0)}
+    dist[source] = 0.0
+    while not q.is_empty():
+        v, d = q.remove_min()
+        del (q_pointer[v])
+        settled[v] = 1
+
+        for i in range(offsets[v], offsets[v + 1]):
+            u = targets[i]
+            new_d = d + weights[i]
+            if settled[u] or new_d >= dist[u]:
+                continue
+
+            dist[u] = new_d
+            if u in q_pointer:
+                q_pointer[u] = q.update(q_pointer[u], u, new_d)
+            else:
+                q_pointer[u] = q.add(u, new_d)
+
+    # undo the reweighting: d(s, t) = d'(s, t) - h[s] + h[t]
+    hs = h[source]
+    for t in range(n):
+        if settled[t]:
+            dist[t] += h[t] - hs
+
+    return dist
+
+
+def johnson(csr, sources=None, workers: int = 1, backend: str = "heapq"):
+    """All pairs shortest distances of a CSRGraph with negative edges allowed.
+
+    One Bellman-Ford pass finds potentials that make every weight
+    non-negative, then a Dijkstra runs from every source. Rows are yielded
+    as soon as they are ready, in the order of sources, so the whole
+    matrix never has to be in memory.
+
+    Args:
+        sources (iterable, optional): vertex ids, every vertex when omitted
+        workers (int): number of processes the Dijkstra runs are spread over
+        backend (str): "heapq" or "locator", see heap_piorityqueue.make_priority_queue
+
+    Yields:
+        tuple: (source id, array("d") of distances to every vertex id, inf when unreachable)
+
+    Raises:
+        ValueError: when there is a negative cycle
+    """
+    if backend == "radix":
+        raise ValueError("Reweighted distances are floats, use the 'heapq' or 'locator' backend")
+    make_priority_queue(backend)  # fail early on unknown names
+
+    h = bellman_ford_potential(csr)
+    sources = range(csr.vertex_count()) if sources is None else list(sources)
+
+    if workers <= 1:
+        positive = reweight(csr, h)
+        for s in sources:
+            yield s, dijkstra_row(positive, h, s, backend)
+        return
+
+    # every worker reweights its own copy, a memory mapped csr is opened again
+    chunksize = max(1, len(sources) // (workers * 4))
+    with Pool(workers, _init_worker, (csr._shareable(), h, backend)) as pool:
+        yield from zip(sources, pool.imap(_johnson_row, sources, chunksize))
+
+
+_shared = None  # (reweighted CSRGraph, potential, backend) of the current process
+
+
+def _init_worker(shareable, h, backend):
+    global _shared
+    _shared = (reweight(_reopen(shareable), h), h, backend)
+
+
+def _johnson_row(source):
+    csr, h, backend = _shared
+    return dijkstra_row(csr, h, source, backend)
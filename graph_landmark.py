@@ -0,0 +1,137 @@
+from array import array
+import struct
+
+_MAGIC = b"ALT1"
+_HEADER = struct.Struct("<4sqqqq?")  # magic, vertices, edges, landmarks, reserved, directed
+
+
+class LandmarkIndex:
+    """Precomputed landmark distances for A* (ALT) queries on a Graph.
+
+    For every landmark L the index keeps d(L, v) and, on directed graphs,
+    d(v, L) for all vertices, flattened into one array("d") each. By the
+    triangle inequality d(u, t) >= d(L, t) - d(L, u) and
+    d(u, t) >= d(u, L) - d(t, L), which gives A* an admissible heuristic.
+
+    The index belongs to one graph and becomes invalid as soon as that
+    graph gets a new vertex or edge.
+    """
+
+    def __init__(self, graph, landmarks, dist_from, dist_to) -> None:
+        """Do not call constructor directly. Use build() or load()."""
+        self._graph = graph
+        self._version = graph._version
+        self._index = dict()
+        for i, v in enumerate(graph.get_vertices()):
+            self._index[v] = i
+
+        self._landmarks = landmarks  # array("i") of vertex ids
+        self._from = dist_from  # _from[l * n + v] = d(landmark l, v)
+        self._to = dist_to  # _to[l * n + v] = d(v, landmark l), same array if undirected
+
+    @classmethod
+    def build(cls, graph, count: int = 4):
+        """Choose count landmarks by farthest-point selection and store their distances"""
+        csr = graph.freeze()
+        n = csr.vertex_count()
+        landmarks = array("i")
+        dist_from = array("d")
+        dist_to = array("d") if graph.is_directed() else dist_from
+        if n == 0:
+            return cls(graph, landmarks, dist_from, dist_to)
+
+        # the first landmark is the vertex farthest from vertex 0, every next one
+        # maximizes the distance to its closest landmark, unreached vertices first
+        closest, _ = csr.dijkstra(0)
+        for _ in range(min(count, n)):
+            candidate = max(range(n), key=lambda v: closest[v])
+            if candidate in landmarks:
+                break
+
+            landmarks.append(candidate)
+            forward, _ = csr.dijkstra(candidate)
+            dist_from.extend(forward)
+            if graph.is_directed():
+                backward, _ = csr.dijkstra(candidate, outgoing=False)
+                dist_to.extend(backward)
+
+            if len(landmarks) == 1:
+                closest = array("d", forward)
+            else:
+                for v in range(n):
+                    if forward[v] < closest[v]:
+                        closest[v] = forward[v]
+            for v in landmarks:
+                closest[v] = -1.0  # never pick a landmark twice
+
+        return cls(graph, landmarks, dist_from, dist_to)
+
+    """ ULILITY """
+
+    def landmark_count(self):
+        return len(self._landmarks)
+
+    def get_landmarks(self):
+        vertices = list(self._index)
+        return [vertices[i] for i in self._landmarks]
+
+    def is_valid(self, graph) -> bool:
+        """True while graph is the indexed graph and has not changed since"""
+        return graph is self._graph and graph._version == self._version
+
+    def lower_bound(self, u, target) -> float:
+        """Admissible estimate of the distance from vertex u to vertex target"""
+        n = len(self._index)
+        u = self._index[u]
+        t = self._index[target]
+
+        bound = 0.0
+        for l in range(len(self._landmarks)):
+            base = l * n
+            # inf - inf gives nan, which never compares greater
+            forward = self._from[base + t] - self._from[base + u]
+            backward = self._to[base + u] - self._to[base + t]
+            if forward > bound:
+                bound = forward
+            if backward > bound:
+                bound = backward
+
+        return bound
+
+    """ STORAGE """
+
+    def save(self, path) -> None:
+        graph = self._graph
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, len(self._index), graph.edge_counts(),
+                                    len(self._landmarks), 0, graph.is_directed()))
+            self._landmarks.tofile(file)
+            self._from.tofile(file)
+            if graph.is_directed():
+                self._to.tofile(file)
+
+    @classmethod
+    def load(cls, path, graph):
+        """Load an index saved from a graph with the same vertices and edges.
+
+        Vertex ids follow graph.get_vertices() order, so the graph has to be
+        rebuilt in the same insertion order as the saved one.
+        """
+        with open(path, "rb") as file:
+            magic, n, m, k, _, directed = _HEADER.unpack(file.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"{path} is not a landmark index file")
+            if (n, m, directed) != (graph.vertex_count(), graph.edge_counts(), graph.is_directed()):
+                raise ValueError("Landmark index does not match the graph")
+
+            landmarks = array("i")
+            landmarks.fromfile(file, k)
+            dist_from = array("d")
+            dist_from.fromfile(file, k * n)
+            if directed:
+                dist_to = array("d")
+                dist_to.fromfile(file, k * n)
+            else:
+                dist_to = dist_from
+
+        return cls(graph, landmarks, dist_from, dist_to)
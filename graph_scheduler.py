@@ -0,0 +1,81 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from time import perf_counter
+
+
+def _timed(task, key):
+    # runs in the worker, so the time does not include waiting in the pool queue
+    start = perf_counter()
+    result = task(key)
+    return result, perf_counter() - start
+
+
+class DAGExecutor:
+    """Run one job per vertex of a directed acyclic Graph.
+
+    A vertex is submitted to the pool as soon as all of its predecessors
+    have finished, so independent jobs run in parallel as far as the edges
+    allow. The job of a vertex is task(vertex.get_key()); with processes=True
+    task and the keys have to be picklable.
+    """
+
+    def __init__(self, graph, workers: int = None, processes: bool = False) -> None:
+        self._graph = graph
+        self._workers = workers
+        self._processes = processes
+
+        self.results = dict()  # vertex -> return value of its job
+        self.timings = dict()  # vertex -> seconds spent in its job
+        self.order = list()  # vertices in completion order
+
+    def _check_acyclic(self):
+        order = self._graph.topological_sort()
+        if len(order) != self._graph.vertex_count():
+            done = set(order)
+            cycle = [v for v in self._graph.get_vertices() if v not in done]
+            raise ValueError(f"Graph has a cycle, these vertices can not be ordered: {', '.join(str(v) for v in cycle[:10])}")
+
+    def run(self, task) -> dict:
+        """Run every job and return the results, the first failing job s exception is raised"""
+        self._check_acyclic()
+        self.results.clear()
+        self.timings.clear()
+        self.order.clear()
+
+        graph = self._graph
+        in_deg = dict()
+        for v in graph.get_vertices():
+            in_deg[v] = graph.get_degree(v, outgoing=False)
+
+        pool_type = ProcessPoolExecutor if self._processes else ThreadPoolExecutor
+        with pool_type(self._workers) as pool:
+            running = dict()  # future -> vertex
+
+            def submit(v):
+                running[pool.submit(_timed, task, v.get_key())] = v
+
+            for v, deg in in_deg.items():
+                if deg == 0:
+                    submit(v)
+
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    v = running.pop(future)
+                    try:
+                        result, seconds = future.result()
+                    except BaseException:
+                        for other in running:
+                            other.cancel()
+                        raise
+
+                    self.results[v] = result
+                    self.timings[v] = seconds
+                    self.order.append(v)
+
+                    for e in graph.get_incident_edges(v):
+                        u = e.oposite(v)
+                        in_deg[u] -= 1
+                        if in_deg[u] == 0:
+                            submit(u)
+
+        return self.results
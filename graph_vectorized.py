@@ -0,0 +1,240 @@
+"""NumPy engines for graph_indexvertex graphs, needs NumPy.
+
+A VectorGraph copies the edges once into CSR arrays, then every
+traversal works on whole frontiers with array operations instead of one
+Python step per edge.
+"""
+import numpy as np
+
+from graph_csr import CSRGraph
+
+
+class VectorGraph:
+    """Read-only NumPy CSR view of a graph_indexvertex.Graph (or a CSRGraph).
+
+    Neighbours of every vertex are stored in increasing order, the same
+    order graph_indexvertex.Graph.get_adjacent_vertex uses.
+    """
+
+    def __init__(self, graph) -> None:
+        csr = graph if isinstance(graph, CSRGraph) else graph.freeze()
+        self._n = csr.vertex_count()
+        self._directed = csr.is_directed()
+        self._indptr = np.frombuffer(csr._offsets, dtype=np.int64)
+        self._indices = np.frombuffer(csr._targets, dtype=np.int32)
+        self._weights = np.frombuffer(csr._weights, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return self._n
+
+    """ PRIVATE """
+
+    def _expand(self, frontier):
+        # every out-edge of the frontier vertices, in frontier order:
+        # returns (edge positions into indices/weights, source of each edge)
+        starts = self._indptr[frontier]
+        counts = self._indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+
+        # position of every edge: start of its run plus its offset in the run
+        run_begin = np.cumsum(counts) - counts
+        positions = np.arange(total, dtype=np.int64) + np.repeat(starts - run_begin, counts)
+        return positions, np.repeat(frontier, counts)
+
+    """ TRAVERSAL """
+
+    def bfs_levels(self, start: int) -> np.ndarray:
+        """Number of edges from start to every vertex, -1 when unreached"""
+        level = np.full(self._n, -1, dtype=np.int32)
+        level[start] = 0
+
+        frontier = np.array([start], dtype=np.int64)
+        depth = 0
+        while frontier.size:
+            depth += 1
+            positions, _ = self._expand(frontier)
+            neighbours = self._indices[positions]
+            fresh = np.unique(neighbours[level[neighbours] == -1])
+            level[fresh] = depth
+            frontier = fresh.astype(np.int64)
+
+        return level
+
+    def reachable(self, start: int) -> np.ndarray:
+        """Boolean mask of the vertices reachable from start"""
+        return self.bfs_levels(start) >= 0
+
+    def bfs_order(self, start: int) -> np.ndarray:
+        """Vertices in the order of graph_indexvertex.Graph.BFS_ordered, computed level by level"""
+        visited = np.zeros(self._n, dtype=bool)
+        visited[start] = True
+        order = [np.array([start], dtype=np.int64)]
+
+        frontier = order[0]
+        while frontier.size:
+            positions, _ = self._expand(frontier)
+            neighbours = self._indices[positions]
+            neighbours = neighbours[~visited[neighbours]]
+            # keep first occurrences, in the order they were discovered
+            _, first = np.unique(neighbours, return_index=True)
+            frontier = neighbours[np.sort(first)].astype(np.int64)
+            visited[frontier] = True
+            order.append(frontier)
+
+        return np.concatenate(order)
+
+    def dfs_order(self, start: int) -> np.ndarray:
+        """Vertices in the order of graph_indexvertex.Graph.DFS_ordered.
+
+        Depth first order is sequential by nature, this walk only gains the
+        visited mask and the neighbour slices of the CSR arrays.
+        """
+        indptr, indices = self._indptr, self._indices
+        visited = np.zeros(self._n, dtype=bool)
+        order = list()
+        stack = [start]
+        while stack:
+            v = stack.pop()
+            if visited[v]:
+                continue
+            visited[v] = True
+            order.append(v)
+
+            neighbours = indices[indptr[v]:indptr[v + 1]]
+            stack.extend(neighbours[~visited[neighbours]].tolist())
+
+        return np.array(order, dtype=np.int64)
+
+
+""" DENSE ENGINES """
+
+
+def weight_matrix(graph) -> np.ndarray:
+    """n x n float64 weights of a graph_indexvertex.Graph, inf where there is no edge"""
+    n = len(graph)
+    if graph.sparse:
+        matrix = np.full((n, n), np.inf)
+        for v in range(n):
+            row = graph[v]  # its keys() are the neighbours only
+            matrix[v, list(row.keys())] = list(row.values())
+        return matrix
+
+    matrix = np.array(graph._out, dtype=np.float64).reshape(n, n)  # None becomes nan
+    matrix[np.isnan(matrix)] = np.inf
+    return matrix
+
+
+def dense_search(matrix: np.ndarray, start: int, prim: bool = False):
+    """Dijkstra (or Prim with prim=True) in O(V^2) on a dense weight matrix.
+
+    Every step settles the argmin of the unsettled vertices and relaxes its
+    whole row at once, so the Python loop runs once per vertex, not per edge.
+
+    Returns:
+        tuple: (dist, pred) arrays, dist is inf and pred -1 when unreached,
+            for Prim dist is the weight of the tree edge to pred
+    """
+    n = len(matrix)
+    dist = np.full(n, np.inf)
+    pred = np.full(n, -1, dtype=np.int64)
+    unsettled = np.ones(n, dtype=bool)
+    dist[start] = 0
+
+    for _ in range(n):
+        v = int(np.argmin(np.where(unsettled, dist, np.inf)))
+        if not unsettled[v] or dist[v] == np.inf:
+            break  # the rest is unreachable
+        unsettled[v] = False
+
+        candidate = matrix[v] if prim else dist[v] + matrix[v]
+        better = unsettled & (candidate < dist)
+        dist[better] = candidate[better]
+        pred[better] = v
+
+    return dist, pred
+
+
+""" ALL PAIRS """
+
+
+class ShortestPaths:
+    """All pairs shortest distances with a next-hop matrix.
+
+    next_hop[i, j] is the vertex after i on a shortest path from i to j,
+    -1 when j is unreachable, so path(i, j) costs O(path length).
+    """
+
+    def __init__(self, dist: np.ndarray, next_hop: np.ndarray) -> None:
+        self.dist = dist
+        self.next_hop = next_hop
+
+    def __len__(self) -> int:
+        return len(self.dist)
+
+    def distance(self, i: int, j: int) -> float:
+        return float(self.dist[i, j])
+
+    def path(self, i: int, j: int) -> list[int]:
+        """Vertices of a shortest path from i to j, empty when there is none"""
+        if self.next_hop[i, j] == -1:
+            return list()
+
+        path = [i]
+        while i != j:
+            i = int(self.next_hop[i, j])
+            path.append(i)
+
+        return path
+
+
+def floyd_warshall(matrix: np.ndarray, block: int = 32) -> ShortestPaths:
+    """Blocked Floyd-Warshall on a weight matrix (inf where there is no edge).
+
+    Pivots are taken block by block. The block rows are finished first,
+    then every other strip of block rows takes the whole block of pivots
+    while it is still in cache. Each pivot is one broadcast of the pivot
+    column against the pivot row. Negative edges are allowed.
+
+    Args:
+        block (int): pivots and rows per strip, a strip and its scratch
+            buffers should fit in the L2 cache
+
+    Raises:
+        ValueError: when there is a negative cycle
+    """
+    n = len(matrix)
+    dist = np.array(matrix, dtype=np.float64)
+    next_hop = np.where(np.isinf(dist), -1, np.arange(n, dtype=np.int32)).astype(np.int32)
+    diagonal = np.arange(n)
+    dist[diagonal, diagonal] = np.minimum(dist[diagonal, diagonal], 0)
+    next_hop[diagonal, diagonal] = diagonal
+
+    # scratch buffers for one strip, reused to avoid an allocation per pivot
+    candidate = np.empty((min(block, n), n))
+    better = np.empty((min(block, n), n), dtype=bool)
+
+    def relax(rows, pivots):
+        strip, hops = dist[rows], next_hop[rows]
+        c, b = candidate[:len(strip)], better[:len(strip)]
+        for k in pivots:
+            np.add(strip[:, k, None], dist[k], out=c)
+            np.less(c, strip, out=b)
+            if not b.any():
+                continue  # common once most distances are final
+            np.minimum(strip, c, out=strip)
+            np.copyto(hops, hops[:, k, None], where=b)
+
+    for low in range(0, n, block):
+        pivots = range(low, min(low + block, n))
+        relax(slice(low, pivots.stop), pivots)
+        for start in range(0, n, block):
+            if start != low:
+                relax(slice(start, min(start + block, n)), pivots)
+
+    if (dist[diagonal, diagonal] < 0).any():
+        raise ValueError("Graph has a negative cycle")
+
+    return ShortestPaths(dist, next_hop)
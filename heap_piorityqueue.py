@@ -1,3 +1,6 @@
+from heapq import heappush, heappop
+
+
 class HeapPiortyQueue:
     """Min-oriented priority queue implemented with a binary heap"""
 
@@ -169,6 +172,176 @@ class HeapPriorityQueueAdaptive(HeapPiortyQueue):
         return token._key, token._value  # because it no longer in queue
 
 
+class LazyHeapPriorityQueue:
+    """Min-oriented priority queue on heapq with (value, count, key) tuple entries.
+
+    update and remove only mark the old entry as removed, it is skipped
+    when it reaches the top. The returned entries play the role of locators.
+    """
+
+    def __init__(self) -> None:
+        self._data = list()
+        self._removed = set()  # counts of entries that are no longer valid
+        self._count = 0  # tie breaker, keys never get compared
+        self._size = 0
+
+    """ PRIVATE """
+
+    def _prune(self):
+        while self._data and self._data[0][1] in self._removed:
+            self._removed.discard(heappop(self._data)[1])
+
+    def _validate(self, entry):
+        if entry[1] in self._removed or entry[1] >= self._count:
+            raise ValueError("Invalid locator")
+
+    """ PUBLIC """
+
+    def __len__(self):
+        return self._size
+
+    def is_empty(self):
+        return self._size == 0
+
+    def add(self, key, value) -> tuple:
+        """Add and return a key-value entry"""
+        entry = (value, self._count, key)
+        self._count += 1
+        self._size += 1
+        heappush(self._data, entry)
+        return entry
+
+    def min(self):
+        """Return the (k,v) pair with smallest v"""
+        if self.is_empty():
+            raise ValueError("Piority queue is empty")
+
+        self._prune()
+        return self._data[0][2], self._data[0][0]
+
+    def remove_min(self):
+        """Remove and return the (k,v) pair with smallest v"""
+        if self.is_empty():
+            raise ValueError("Piority queue is empty")
+
+        self._prune()
+        value, _, key = heappop(self._data)
+        self._size -= 1
+        return key, value
+
+    def update(self, entry, key, value) -> tuple:
+        """Replace entry with a new one, callers keep the returned entry"""
+        self._validate(entry)
+        self._removed.add(entry[1])
+        self._size -= 1
+        return self.add(key, value)
+
+    def remove(self, entry) -> tuple:
+        """Remove and return the (k,v) pair of entry"""
+        self._validate(entry)
+        self._removed.add(entry[1])
+        self._size -= 1
+        return entry[2], entry[0]
+
+
+class RadixHeapPriorityQueue(LazyHeapPriorityQueue):
+    """Monotone min priority queue for non-negative integer values.
+
+    Every value added must be at least the last removed minimum, which holds
+    for Dijkstra with integer weights. Entries live in buckets by the highest
+    bit in which they differ from that minimum, so each entry moves down at
+    most once per bit instead of being sifted through a heap.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._data = [list()]  # bucket i holds values whose (value ^ last).bit_length() == i
+        self._last = 0
+
+    """ PRIVATE """
+
+    def _push(self, entry):
+        i = (entry[0] ^ self._last).bit_length()
+        while i >= len(self._data):
+            self._data.append(list())
+        self._data[i].append(entry)
+
+    def _prune(self):
+        # refill bucket 0 from the first non-empty bucket
+        removed = self._removed
+        bucket0 = self._data[0]
+        while True:
+            while bucket0 and bucket0[-1][1] in removed:
+                removed.discard(bucket0.pop()[1])
+            if bucket0:
+                return
+
+            i = 1
+            while not self._data[i]:
+                i += 1
+
+            bucket = self._data[i]
+            self._data[i] = list()
+            live = list()
+            for entry in bucket:
+                if entry[1] in removed:
+                    removed.discard(entry[1])
+                else:
+                    live.append(entry)
+            if not live:
+                continue
+
+            self._last = min(entry[0] for entry in live)
+            for entry in live:
+                self._push(entry)
+
+    """ PUBLIC """
+
+    def add(self, key, value) -> tuple:
+        """Add and return a key-value entry"""
+        if not isinstance(value, int) or value < self._last:
+            raise ValueError("Radix heap needs integer values no smaller than the last minimum")
+
+        entry = (value, self._count, key)
+        self._count += 1
+        self._size += 1
+        self._push(entry)
+        return entry
+
+    def min(self):
+        """Return the (k,v) pair with smallest v"""
+        if self.is_empty():
+            raise ValueError("Piority queue is empty")
+
+        self._prune()
+        return self._data[0][-1][2], self._data[0][-1][0]
+
+    def remove_min(self):
+        """Remove and return the (k,v) pair with smallest v"""
+        if self.is_empty():
+            raise ValueError("Piority queue is empty")
+
+        self._prune()
+        value, _, key = self._data[0].pop()
+        self._size -= 1
+        return key, value
+
+
+# backends accepted by Graph.dijkstra and Graph.MST_prim
+PRIORITY_QUEUES = {
+    "locator": HeapPriorityQueueAdaptive,
+    "heapq": LazyHeapPriorityQueue,
+    "radix": RadixHeapPriorityQueue,
+}
+
+
+def make_priority_queue(backend: str = "locator"):
+    if backend not in PRIORITY_QUEUES:
+        raise ValueError(
+            f"Unknown priority queue backend {backend!r}, expected one of {list(PRIORITY_QUEUES)}")
+    return PRIORITY_QUEUES[backend]()
+
+
 if __name__ == "__main__":
     q = HeapPriorityQueueAdaptive()
     for i in [int(x) for x in "19 2 63 52 47 6 3 18 33".split()]:
@@ -2,10 +2,13 @@ class Parition:
     class _Poisition:
         """Create a new position that is the leader of its own group."""
 
+        __slots__ = "container", "_key", "_size", "_rank", "_parent"
+
         def __init__(self, container, key) -> None:
             self.container = container  # reference to Partition instance
             self._key = key
             self._size = 1
+            self._rank = 0  # upper bound of the group tree height
             self._parent = self  # convention for group leader
 
         def get_key(self):
@@ -17,19 +20,29 @@ class Parition:
 
     def find(self, position):
         """Finds the group containging p and return the position of its leader"""
-        while position._parent is not position:
-            position = position._parent
+        leader = position
+        while leader._parent is not leader:
+            leader = leader._parent
+
+        # path compression, every position on the way now points to the leader
+        while position is not leader:
+            position._parent, position = leader, position._parent
 
-        return position
+        return leader
 
     def union(self, a, b):
+        """Merges the groups of a and b, return False if they were already one group"""
         a = self.find(a)
         b = self.find(b)
-
-        if a._size < b._size:
-            b._size += a._size
-            a._parent = b
-
-        else:
-            a._size += b._size
-            b._parent = a
+        if a is b:
+            return False
+
+        # union by rank, the shallower tree goes under the deeper one
+        if a._rank < b._rank:
+            a, b = b, a
+        elif a._rank == b._rank:
+            a._rank += 1
+
+        b._parent = a
+        a._size += b._size
+        return True